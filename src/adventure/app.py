@@ -3,11 +3,13 @@
 from importlib import resources
 from pathlib import Path
 
+from sqlalchemy import event
 from sqlmodel import Session, SQLModel, create_engine
 from xitzin import Xitzin
 
 from .config import Config
 from .engine.loader import load_world
+from .engine.world import World
 from .logging import get_logger
 
 logger = get_logger(__name__)
@@ -18,8 +20,21 @@ def _get_data_path() -> Path:
     return resources.files("adventure.data").joinpath("advent.dat")
 
 
-def create_app(config: Config | None = None) -> Xitzin:
-    """Create and configure the Xitzin application."""
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Use WAL with relaxed fsyncs: a crash can lose at most the last turn."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def create_app(config: Config | None = None, world: World | None = None) -> Xitzin:
+    """Create and configure the Xitzin application.
+
+    *world* skips parsing advent.dat at startup; the World is read-only,
+    so one instance can back any number of apps.
+    """
     config = config or Config.from_env()
 
     templates_dir = Path(__file__).parent / "templates"
@@ -31,6 +46,8 @@ def create_app(config: Config | None = None) -> Xitzin:
     )
 
     engine = create_engine(config.database_url)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
     app.state.engine = engine
     app.state.config = config
 
@@ -40,8 +57,7 @@ def create_app(config: Config | None = None) -> Xitzin:
         SQLModel.metadata.create_all(engine)
         logger.debug("database_setup_complete")
 
-        data_path = _get_data_path()
-        app.state.world = load_world(data_path)
+        app.state.world = world or load_world(_get_data_path())
         logger.info(
             "world_loaded",
             rooms=len(app.state.world.rooms),
@@ -5,10 +5,11 @@ It tokenizes, resolves vocabulary, and dispatches to handler functions.
 All handlers mutate state in place and return descriptive text.
 """
 
-import random
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Sequence
+from functools import lru_cache
+from itertools import cycle
+from operator import countOf
 
-from .loader import LONG_WORDS
 from .state import (
     AXE,
     BEAR,
@@ -139,11 +140,8 @@ def _tick_lamp(world: World, state: GameState) -> str | None:
 
 def _count_treasures_found(world: World, state: GameState) -> int:
     """Count treasures that have been seen (have a prop value set)."""
-    count = 0
-    for obj_id, obj in world.objects.items():
-        if obj.is_treasure and obj_id in state.object_props:
-            count += 1
-    return count
+    props = state.object_props
+    return sum(1 for obj_id in world.treasure_ids if obj_id in props)
 
 
 def _tick_closing(world: World, state: GameState) -> str | None:
@@ -218,9 +216,7 @@ def _close_cave(world: World, state: GameState) -> str:
     state.object_locations[BIRD] = 116
 
     # Teleport player to NE end of repository (room 115)
-    state.old_room = state.current_room
-    state.current_room = 115
-    state.visited_rooms.add(115)
+    state.teleport(115)
 
     return world.messages.get(132, "The cave is now closed.")
 
@@ -236,42 +232,31 @@ def _dwarf_valid_destinations(
     world: World,
     room_n: int,
     old_room_n: int,
-) -> list[int]:
-    """Return sorted list of rooms a dwarf can move to from *room_n*.
+) -> tuple[int, ...]:
+    """Return the sorted rooms a dwarf can move to from *room_n*.
 
-    Excludes: the current room, the previous room (no backtracking),
-    forced-movement rooms, ``not_dwarf`` routes, and rooms before
-    the Hall of Mists (number < 15).
+    Uses the loader's precomputed ``Room.dwarf_destinations`` and only
+    drops the previous room (no backtracking) per turn. The shared tuple
+    is returned as-is when the previous room is not among them.
     """
     room = world.rooms.get(room_n)
     if room is None:
-        return []
-    destinations: set[int] = set()
-    for move in room.travel_table:
-        if move.is_forced:
-            continue
-        if move.condition == ("not_dwarf",):
-            continue
-        dest = move.destination
-        if not (0 < dest <= 300):
-            continue
-        if dest < 15:
-            continue
-        if dest == room_n or dest == old_room_n:
-            continue
-        destinations.add(dest)
-    return sorted(destinations)
+        return ()
+    destinations = room.dwarf_destinations
+    if old_room_n not in destinations:
+        return destinations
+    return tuple(dest for dest in destinations if dest != old_room_n)
 
 
 def _dwarf_first_encounter(world: World, state: GameState) -> str | None:
     """Handle stage-1 first encounter (5% chance per turn)."""
-    if state.current_room < 15 or random.random() < 0.95:
+    if state.current_room < 15 or state.rng.random() < 0.95:
         return None
     state.dwarf_stage = 2
     # Randomly thin the pack (remove 0-2 dwarves)
     for _ in range(2):
-        if state.dwarf_locations and random.random() < 0.5:
-            idx = random.randrange(len(state.dwarf_locations))
+        if state.dwarf_locations and state.rng.random() < 0.5:
+            idx = state.rng.randrange(len(state.dwarf_locations))
             state.dwarf_locations.pop(idx)
             state.dwarf_old_locations.pop(idx)
             state.dwarf_seen.pop(idx)
@@ -302,7 +287,7 @@ def _move_single_dwarf(
     old_loc = state.dwarf_old_locations[i]
 
     candidates = _dwarf_valid_destinations(world, loc, old_loc)
-    new_room = random.choice(candidates) if candidates else old_loc
+    new_room = state.rng.choice(candidates) if candidates else old_loc
 
     state.dwarf_old_locations[i] = loc
     state.dwarf_locations[i] = new_room
@@ -319,7 +304,7 @@ def _move_single_dwarf(
 
     if state.current_room == loc:
         state.knife_location = state.current_room
-        hit = random.random() < 0.095 * (state.dwarf_stage - 2)
+        hit = state.rng.random() < 0.095 * (state.dwarf_stage - 2)
         return 1, hit
     return 0, False
 
@@ -430,13 +415,10 @@ def _pirate_no_treasure(
     """
     treasure_here = any(
         state.object_locations.get(obj_id) == state.current_room
-        for obj_id, obj in world.objects.items()
-        if obj.is_treasure
+        for obj_id in world.treasure_ids
     )
-    impossible_treasures = sum(
-        1
-        for obj_id, obj in world.objects.items()
-        if obj.is_treasure and state.object_locations.get(obj_id) == DESTROYED
+    impossible_treasures = countOf(
+        map(state.object_locations.get, world.treasure_ids), DESTROYED
     )
     chest_placed = state.object_locations.get(CHEST, DESTROYED) != DESTROYED
     lamp_here = state.object_locations.get(LAMP) in (
@@ -452,7 +434,7 @@ def _pirate_no_treasure(
         and state.lamp_on
     )
     if not shiver:
-        if old_loc != loc and random.random() < 0.2:
+        if old_loc != loc and state.rng.random() < 0.2:
             parts.append(
                 world.messages.get(
                     127,
@@ -478,13 +460,9 @@ def _move_pirate(world: World, state: GameState) -> bool:
     loc = state.pirate_location
     old_loc = state.pirate_old_location
 
-    candidates = _dwarf_valid_destinations(world, loc, old_loc)
-    candidates = [
-        r
-        for r in candidates
-        if not world.rooms.get(r, world.rooms[1]).is_forbidden_to_pirate
-    ]
-    new_room = random.choice(candidates) if candidates else old_loc
+    room = world.rooms.get(loc)
+    candidates = [r for r in room.pirate_destinations if r != old_loc] if room else []
+    new_room = state.rng.choice(candidates) if candidates else old_loc
 
     state.pirate_old_location = loc
     state.pirate_location = new_room
@@ -521,8 +499,8 @@ def _tick_pirate(
     loc = state.pirate_location
     treasures = [
         obj_id
-        for obj_id, obj in world.objects.items()
-        if obj.is_treasure and state.object_locations.get(obj_id) == CARRIED
+        for obj_id in world.treasure_ids
+        if state.object_locations.get(obj_id) == CARRIED
     ]
     if PLATINUM in treasures and state.current_room in (100, 101):
         treasures.remove(PLATINUM)
@@ -586,7 +564,92 @@ def _dispatch_verb(
 
 
 def handle_command(world: World, state: GameState, raw_input: str) -> str:
-    """Process a command and return the response text."""
+    """Process a command and return the response text.
+
+    Keeps ``state.score`` current so callers can read it without
+    rescoring the whole world.
+    """
+    parsed = parse_command(raw_input)
+    if parsed is None:
+        return handle_parsed(world, state, None, None)
+    return handle_parsed(world, state, *parsed)
+
+
+def handle_parsed(
+    world: World, state: GameState, verb: str | None, noun: str | None
+) -> str:
+    """Process an already-parsed command (see parse_command).
+
+    A ``None`` verb stands for blank input.
+    """
+    result = _process_command(world, state, verb, noun)
+    state.score = calculate_score(world, state)
+    return result
+
+
+def handle_commands(
+    world: World, state: GameState, commands: Iterable[str]
+) -> list[str]:
+    """Run several commands in order and return their responses.
+
+    Stops after the command that finishes the game, so the result may be
+    shorter than *commands*. ``state.score`` is refreshed once at the end
+    rather than after every turn.
+    """
+    responses = []
+    for raw_input in commands:
+        parsed = parse_command(raw_input)
+        verb, noun = parsed if parsed is not None else (None, None)
+        responses.append(_process_command(world, state, verb, noun))
+        if state.is_finished:
+            break
+    state.score = calculate_score(world, state)
+    return responses
+
+
+def advance_until(
+    world: World,
+    state: GameState,
+    predicate: Callable[[GameState], bool],
+    commands: Sequence[str] = ("n", "s"),
+    max_turns: int = 1000,
+) -> int:
+    """Repeat *commands* in a cycle until *predicate* holds for the state.
+
+    The predicate is checked before every turn. Stops early if the game
+    finishes or after *max_turns* turns. Returns the number of turns
+    taken; ``state.score`` is refreshed once at the end.
+    """
+    parsed = [parse_command(raw_input) or (None, None) for raw_input in commands]
+    turns = 0
+    for verb, noun in cycle(parsed):
+        if turns >= max_turns or state.is_finished or predicate(state):
+            break
+        _process_command(world, state, verb, noun)
+        turns += 1
+    state.score = calculate_score(world, state)
+    return turns
+
+
+@lru_cache(maxsize=1024)
+def parse_command(raw_input: str) -> tuple[str, str | None] | None:
+    """Split raw input into a normalized (verb, noun) pair.
+
+    Returns None for blank input. Parsing depends only on the text, so
+    results are cached; players repeat the same few commands constantly.
+    """
+    words = raw_input.strip().lower().split()
+    if not words:
+        return None
+    verb = _normalize_word(words[0])
+    noun = _normalize_word(words[1]) if len(words) > 1 else None
+    return verb, noun
+
+
+def _process_command(
+    world: World, state: GameState, verb: str | None, noun: str | None
+) -> str:
+    """Run one turn: tick clocks and dispatch the parsed command."""
     state.turns += 1
 
     lamp_msg = _tick_lamp(world, state)
@@ -596,13 +659,9 @@ def handle_command(world: World, state: GameState, raw_input: str) -> str:
     # Cave closing clock tick
     closing_msg = _tick_closing(world, state)
 
-    words = raw_input.strip().lower().split()
-    if not words:
+    if verb is None:
         return "I beg your pardon?"
 
-    verb = _normalize_word(words[0])
-    noun = _normalize_word(words[1]) if len(words) > 1 else None
-
     # Fee/fie/foe/foo/fum are special words dispatched by name
     if verb in ("fee", "fie", "foe", "foo", "fum"):
         result = _cmd_fee_word(world, state, verb)
@@ -621,8 +680,7 @@ def handle_command(world: World, state: GameState, raw_input: str) -> str:
 
 def _is_motion_word(world: World, word: str) -> bool:
     """Check if a word is a motion verb in the vocabulary."""
-    entry = _vocab_lookup(world, word)
-    return entry is not None and entry.kind == "motion"
+    return word in world.motion_verbs
 
 
 def _resolve_noun(world: World, state: GameState, noun: str | None) -> int | None:
@@ -639,11 +697,9 @@ def _resolve_noun(world: World, state: GameState, noun: str | None) -> int | Non
         return None
     if _is_here(state, default):
         return default
-    # Check all objects for a same-name match that IS here.
-    for obj_id, obj in world.objects.items():
-        if obj_id == default:
-            continue
-        if noun in (n[:WORD_LENGTH] for n in obj.names) and _is_here(state, obj_id):
+    # Check other objects sharing this name for one that IS here.
+    for obj_id in world.object_ids_by_name.get(noun, ()):
+        if obj_id != default and _is_here(state, obj_id):
             return obj_id
     return default
 
@@ -676,7 +732,7 @@ def _is_dark(world: World, state: GameState) -> bool:
 
 def _carried_count(state: GameState) -> int:
     """Count how many objects the player is carrying."""
-    return sum(1 for loc in state.object_locations.values() if loc == CARRIED)
+    return countOf(state.object_locations.values(), CARRIED)
 
 
 def get_room_description(world: World, state: GameState) -> str:
@@ -688,15 +744,15 @@ def get_room_description(world: World, state: GameState) -> str:
     if _is_dark(world, state):
         return "It is now pitch dark. If you proceed you will likely fall into a pit."
 
+    # Descriptions are stripped once at load time
     if (
-        state.current_room in state.visited_rooms
+        state.has_visited(state.current_room)
         and room.short_description
         and state.detail_level == 0
     ):
-        return room.short_description.strip()
+        return room.short_description
 
-    desc = room.long_description or room.short_description or "You are somewhere."
-    return desc.strip()
+    return room.long_description or room.short_description or "You are somewhere."
 
 
 def get_visible_objects(world: World, state: GameState) -> list[str]:
@@ -721,30 +777,6 @@ def get_visible_objects(world: World, state: GameState) -> list[str]:
     return descriptions
 
 
-def _direction_verb_map(world: World) -> dict[int, str]:
-    """Map vocabulary verb numbers to display names for compass directions."""
-    labels = {
-        "n": "North",
-        "s": "South",
-        "e": "East",
-        "w": "West",
-        "u": "Up",
-        "d": "Down",
-        "in": "In",
-        "out": "Out",
-        "ne": "NE",
-        "se": "SE",
-        "sw": "SW",
-        "nw": "NW",
-    }
-    result: dict[int, str] = {}
-    for short, label in labels.items():
-        entry = _vocab_lookup(world, short)
-        if entry is not None:
-            result[entry.number] = label
-    return result
-
-
 def get_exits(world: World, state: GameState) -> list[str]:
     """Get available exit directions for the current room."""
     if _is_dark(world, state):
@@ -753,24 +785,8 @@ def get_exits(world: World, state: GameState) -> list[str]:
     room = world.rooms.get(state.current_room)
     if room is None:
         return []
-
-    verb_to_name = _direction_verb_map(world)
-
-    exits = []
-    seen_names: set[str] = set()
-    for move in room.travel_table:
-        if move.is_forced:
-            continue
-        # Only show moves that go to rooms (positive destinations)
-        if move.destination <= 0 or move.destination > 300:
-            continue
-        for verb_n in move.verbs:
-            if verb_n in verb_to_name:
-                name = verb_to_name[verb_n]
-                if name not in seen_names:
-                    exits.append(name)
-                    seen_names.add(name)
-    return exits
+    # Exit labels are static per room and precomputed by the loader
+    return list(room.exits)
 
 
 def get_inventory(world: World, state: GameState) -> list[str]:
@@ -786,27 +802,9 @@ def get_inventory(world: World, state: GameState) -> list[str]:
     return items
 
 
-def _vocab_lookup(world: World, word: str):
-    """Look up a word in the vocabulary, trying both the truncated
-    and LONG_WORDS-expanded forms so that 5-char input like 'plove'
-    finds the vocabulary entry stored under 'plover'.
-    """
-    entry = world.vocabulary.get(word)
-    if entry is not None:
-        return entry
-    expanded = LONG_WORDS.get(word)
-    if expanded is not None:
-        return world.vocabulary.get(expanded)
-    return None
-
-
 def _resolve_direction(world: World, direction: str) -> int | None:
     """Resolve a direction string to a verb number via the vocabulary."""
-    direction = _normalize_word(direction.lower())
-    entry = _vocab_lookup(world, direction)
-    if entry is not None and entry.kind == "motion":
-        return entry.number
-    return None
+    return world.motion_verbs.get(_normalize_word(direction.lower()))
 
 
 def _move_to(world: World, state: GameState, dest: int) -> str:
@@ -821,13 +819,13 @@ def _move_to(world: World, state: GameState, dest: int) -> str:
     state.old_old_room = state.old_room
     state.old_room = state.current_room
     state.current_room = dest
-    state.visited_rooms.add(dest)
+    state.mark_visited(dest)
 
     new_room = world.rooms.get(dest)
     if new_room and new_room.travel_table and new_room.travel_table[0].is_forced:
         return _handle_forced(world, state, new_room)
 
-    if _is_dark(world, state) and random.random() < 0.35:
+    if _is_dark(world, state) and state.rng.random() < 0.35:
         return _cmd_die(world, state)
 
     # Activate dwarf stage 0 → 1 on first entry into deep cave
@@ -851,16 +849,12 @@ def _move_to(world: World, state: GameState, dest: int) -> str:
 def _handle_forced(world: World, state: GameState, room) -> str:
     """Walk forced movement entries with condition checking."""
     msg = get_room_description(world, state)
-    for move in room.travel_table:
-        if not move.is_forced:
-            continue
+    for move in room.forced_moves:
         if not _check_condition(world, state, move.condition):
             continue
         dest = move.destination
         if 0 < dest <= 300:
-            state.old_room = state.current_room
-            state.current_room = dest
-            state.visited_rooms.add(dest)
+            state.teleport(dest)
             next_room = world.rooms.get(dest)
             if (
                 next_room
@@ -918,9 +912,7 @@ def _walk_travel_table(
     verb_n: int,
 ) -> str | None:
     """Walk the travel table for the given verb and return response."""
-    for move in room.travel_table:
-        if verb_n not in move.verbs and not move.is_forced:
-            continue
+    for move in room.travel_by_verb.get(verb_n, room.forced_moves):
         if not _check_condition(world, state, move.condition):
             continue
         dest = move.destination
@@ -964,7 +956,7 @@ def _check_condition(world: World, state: GameState, condition: tuple) -> bool:
         case (None,):
             return True
         case ("%", chance):
-            return random.randint(1, 100) <= chance
+            return state.rng.randint(1, 100) <= chance
         case ("not_dwarf",):
             return True  # Simplified: always true for non-dwarves
         case ("carrying", obj_n):
@@ -1155,6 +1147,23 @@ def _cmd_drop(world: World, state: GameState, noun: str | None = None) -> str:
     if obj_n is None:
         return f"I don't know what '{noun}' is."
 
+    return _drop_object(state, obj_n)
+
+
+def drop_object(world: World, state: GameState, obj_n: int) -> str:
+    """Drop an already-resolved object in the current room.
+
+    Applies the same special cases as DROP but skips parsing and does not
+    take a turn. ``state.score`` is refreshed, since a treasure dropped in
+    the building scores at once.
+    """
+    result = _drop_object(state, obj_n)
+    state.score = calculate_score(world, state)
+    return result
+
+
+def _drop_object(state: GameState, obj_n: int) -> str:
+    """Drop *obj_n* with DROP's special cases, leaving the score alone."""
     if not _is_carrying(state, obj_n):
         return "You aren't carrying it!"
 
@@ -1202,6 +1211,21 @@ def _cmd_drop(world: World, state: GameState, noun: str | None = None) -> str:
     return "OK."
 
 
+def drop_all_carried(
+    world: World, state: GameState, obj_ids: Iterable[int]
+) -> list[str]:
+    """Drop every object in *obj_ids* the player is carrying.
+
+    Each drop applies DROP's special cases. Returns the responses for the
+    objects actually dropped; ``state.score`` is refreshed once at the end.
+    """
+    responses = [
+        _drop_object(state, obj_n) for obj_n in obj_ids if _is_carrying(state, obj_n)
+    ]
+    state.score = calculate_score(world, state)
+    return responses
+
+
 def _open_grate(state: GameState) -> str:
     if not _is_here(state, KEYS):
         return "You have no keys!"
@@ -1310,8 +1334,7 @@ def _cmd_look(world: World, state: GameState, noun: str | None = None) -> str:
     if _is_dark(world, state):
         return "It is now pitch dark. If you proceed you will likely fall into a pit."
 
-    desc = room.long_description or room.short_description or "You are somewhere."
-    return desc.strip()
+    return room.long_description or room.short_description or "You are somewhere."
 
 
 def _cmd_inventory(world: World, state: GameState, noun: str | None = None) -> str:
@@ -1446,8 +1469,8 @@ def _cmd_throw(world: World, state: GameState, noun: str | None = None) -> str:
         ]
         state.object_locations[AXE] = state.current_room
         if dwarves_here:
-            target = random.choice(dwarves_here)
-            if random.choice([True, False, False]):  # 1/3 kill chance
+            target = state.rng.choice(dwarves_here)
+            if state.rng.choice([True, False, False]):  # 1/3 kill chance
                 state.dwarf_locations.pop(target)
                 state.dwarf_old_locations.pop(target)
                 state.dwarf_seen.pop(target)
@@ -1651,24 +1674,21 @@ def _cmd_help(world: World, state: GameState, noun: str | None = None) -> str:
 def _score_treasures(world: World, state: GameState) -> int:
     """Score points for treasures found and stored."""
     score = 0
-    for obj_id, obj in world.objects.items():
-        if not obj.is_treasure:
+    locations = state.object_locations
+    props = state.object_props
+    for obj_id, value in world.treasure_values.items():
+        prop = props.get(obj_id)
+        if prop is None:
             continue
-        if obj_id < CHEST:
-            value = 12
-        elif obj_id == CHEST:
-            value = 14
-        else:
-            value = 16
-        if obj_id in state.object_props:
-            score += 2
-        in_building = state.object_locations.get(obj_id) == 3
-        prop_zero = state.object_props.get(obj_id, -1) == 0
-        if in_building and prop_zero:
-            score += value - 2
+        # 2 points for finding it, the rest once it rests intact in the building
+        score += value if prop == 0 and locations.get(obj_id) == 3 else 2
     return score
 
 
+# Endgame blast bonus code → points (10 if the cave closed without a blast)
+_BLAST_BONUS_SCORES = {133: 45, 134: 30, 135: 25, 0: 10}
+
+
 def calculate_score(world: World, state: GameState) -> int:
     """Calculate the current score using the original 350-point formula."""
     score = 2 + _score_treasures(world, state)
@@ -1691,8 +1711,7 @@ def calculate_score(world: World, state: GameState) -> int:
     # Cave closed + endgame bonus
     if state.is_closed:
         score += 25
-        bonus_scores = {133: 45, 134: 30, 135: 25, 0: 10}
-        score += bonus_scores.get(state.bonus, 10)
+        score += _BLAST_BONUS_SCORES.get(state.bonus, 10)
 
     # Magazine in Witt's End (room 108)
     if state.object_locations.get(MAGAZINE) == 108:
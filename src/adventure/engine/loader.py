@@ -4,10 +4,11 @@ The file has 12 sections separated by -1 lines. A final 0 ends the file.
 Section format reference: Brandon Rhodes' python-adventure data.py.
 """
 
+import sys
 from collections.abc import Callable
 from pathlib import Path
 
-from .world import Hint, Move, Obj, Room, Word, World
+from .world import CHEST, DESTROYED, Hint, Move, Obj, Room, Word, World
 
 LONG_WORDS = {
     w[:5]: w
@@ -29,6 +30,22 @@ LONG_WORDS = {
 
 WORD_KINDS = ["motion", "noun", "verb", "special"]
 
+# Motion words listed as exits, with their display labels
+DIRECTION_LABELS = {
+    "n": "North",
+    "s": "South",
+    "e": "East",
+    "w": "West",
+    "u": "Up",
+    "d": "Down",
+    "in": "In",
+    "out": "Out",
+    "ne": "NE",
+    "se": "SE",
+    "sw": "SW",
+    "nw": "NW",
+}
+
 
 def _expand_tabs(segments: list[str]) -> str:
     """Expand tabs like the original FORTRAN."""
@@ -257,6 +274,122 @@ def _parse_section12(world: World, fields: list) -> None:
         world.magic_messages[n] = text
 
 
+def _build_initial_locations(world: World) -> None:
+    """Precompute each object's starting room so new games can copy it."""
+    world.initial_object_locations = {
+        obj_id: obj.initial_rooms[0] if obj.initial_rooms else DESTROYED
+        for obj_id, obj in world.objects.items()
+    }
+
+
+def _build_treasure_values(world: World) -> None:
+    """Precompute the treasure ids and each treasure's full value for scoring.
+
+    Treasures numbered below the chest are worth 12, the chest 14, and
+    those above it 16 (2 of which are awarded just for finding them).
+    """
+    world.treasure_ids = tuple(
+        sorted(obj_id for obj_id, obj in world.objects.items() if obj.is_treasure)
+    )
+    world.treasure_values = {
+        obj_id: 12 if obj_id < CHEST else 14 if obj_id == CHEST else 16
+        for obj_id in world.treasure_ids
+    }
+
+
+def _build_room_text(world: World) -> None:
+    """Precompute the static per-room strings shown on every render.
+
+    Descriptions are stripped once here, and each room gets its tuple of
+    compass exits (visible destinations only, first label wins).
+    """
+    verb_labels = {
+        world.vocabulary[word].number: label
+        for word, label in DIRECTION_LABELS.items()
+        if word in world.vocabulary
+    }
+    for room in world.rooms.values():
+        room.long_description = room.long_description.strip()
+        room.short_description = room.short_description.strip()
+
+        exits: list[str] = []
+        for move in room.travel_table:
+            if move.is_forced or not 0 < move.destination <= 300:
+                continue
+            for verb_n in move.verbs:
+                label = verb_labels.get(verb_n)
+                if label is not None and label not in exits:
+                    exits.append(label)
+        room.exits = tuple(exits)
+
+
+def _build_wander_routes(world: World) -> None:
+    """Precompute where dwarves and the pirate can wander from each room.
+
+    Skips forced-movement and ``not_dwarf`` routes, special destinations,
+    the room itself, and rooms before the Hall of Mists (number < 15).
+    The pirate additionally avoids rooms forbidden to him.
+    """
+    for room in world.rooms.values():
+        destinations: set[int] = set()
+        for move in room.travel_table:
+            if move.is_forced or move.condition == ("not_dwarf",):
+                continue
+            dest = move.destination
+            if 15 <= dest <= 300 and dest != room.number:
+                destinations.add(dest)
+        room.dwarf_destinations = tuple(sorted(destinations))
+        room.pirate_destinations = tuple(
+            dest
+            for dest in room.dwarf_destinations
+            if not world.rooms.get(dest, world.rooms[1]).is_forbidden_to_pirate
+        )
+
+
+def _build_travel_index(world: World) -> None:
+    """Index each room's travel table by verb.
+
+    A move is listed under every verb it answers to; forced moves apply
+    to any verb, so they are listed everywhere and kept in forced_moves.
+    """
+    for room in world.rooms.values():
+        table = room.travel_table
+        verbs = dict.fromkeys(verb_n for move in table for verb_n in move.verbs)
+        room.travel_by_verb = {
+            verb_n: tuple(m for m in table if m.is_forced or verb_n in m.verbs)
+            for verb_n in verbs
+        }
+        room.forced_moves = tuple(m for m in table if m.is_forced)
+
+
+def _build_name_indexes(world: World) -> None:
+    """Intern vocabulary keys and index objects by their 5-letter names."""
+    world.vocabulary = {sys.intern(k): v for k, v in world.vocabulary.items()}
+    world.object_names = {sys.intern(k): v for k, v in world.object_names.items()}
+
+    by_name: dict[str, list[int]] = {}
+    for obj_id, obj in world.objects.items():
+        for name in dict.fromkeys(n[:5] for n in obj.names):
+            by_name.setdefault(sys.intern(name), []).append(obj_id)
+    world.object_ids_by_name = {k: tuple(v) for k, v in by_name.items()}
+
+
+def _build_motion_index(world: World) -> None:
+    """Resolve every word that moves the player to its verb number.
+
+    Truncated forms like "plove" are looked up through LONG_WORDS, but
+    only when the truncated text is not a vocabulary word of its own.
+    """
+    motion: dict[str, int] = {}
+    for word in (*world.vocabulary, *LONG_WORDS):
+        entry = world.vocabulary.get(word)
+        if entry is None and word in LONG_WORDS:
+            entry = world.vocabulary.get(LONG_WORDS[word])
+        if entry is not None and entry.kind == "motion":
+            motion[sys.intern(word)] = entry.number
+    world.motion_verbs = motion
+
+
 def _parse_fields(line: str) -> list:
     """Parse a tab-delimited line into typed fields (int or str)."""
     fields = []
@@ -315,4 +448,11 @@ def load_world(data_path: Path) -> World:
 
             _read_section(fh, parser)
 
+    _build_initial_locations(world)
+    _build_treasure_values(world)
+    _build_room_text(world)
+    _build_wander_routes(world)
+    _build_travel_index(world)
+    _build_name_indexes(world)
+    _build_motion_index(world)
     return world
@@ -0,0 +1,138 @@
+"""Compact binary snapshots of GameState for per-player persistence.
+
+A snapshot is a version byte, one fixed struct holding every scalar
+field, then length-prefixed arrays for the collection fields. Packing
+and unpacking are a handful of struct calls instead of a pickle walk.
+The game's RNG is not stored; an unpacked state starts with a fresh one.
+"""
+
+import struct
+
+from .state import GameState
+
+SNAPSHOT_VERSION = 1
+
+_VERSION = struct.Struct("<B")
+_COUNT = struct.Struct("<H")
+
+# (field name, struct code) for every scalar GameState field, in layout order
+_SCALAR_FIELDS: tuple[tuple[str, str], ...] = (
+    ("current_room", "h"),
+    ("old_room", "h"),
+    ("old_old_room", "h"),
+    ("turns", "i"),
+    ("score", "i"),
+    ("lamp_turns", "i"),
+    ("lamp_on", "?"),
+    ("clock1", "i"),
+    ("clock2", "i"),
+    ("is_closing", "?"),
+    ("is_closed", "?"),
+    ("panic", "?"),
+    ("deaths", "h"),
+    ("max_deaths", "h"),
+    ("is_finished", "?"),
+    ("dwarf_stage", "h"),
+    ("dwarf_killed", "h"),
+    ("knife_location", "h"),
+    ("pirate_location", "h"),
+    ("pirate_old_location", "h"),
+    ("pirate_seen", "?"),
+    ("gave_up", "?"),
+    ("treasures_found", "h"),
+    ("said_west", "?"),
+    ("detail_level", "i"),
+    ("bear_tame", "?"),
+    ("foobar", "i"),
+    ("bonus", "h"),
+    ("treasures_not_found", "h"),
+)
+_SCALAR_NAMES = tuple(name for name, _ in _SCALAR_FIELDS)
+_SCALARS = struct.Struct("<" + "".join(code for _, code in _SCALAR_FIELDS))
+
+
+def _pack_array(code: str, values) -> bytes:
+    """Pack a count-prefixed array of same-typed values."""
+    values = list(values)
+    return struct.pack(f"<H{len(values)}{code}", len(values), *values)
+
+
+def _pack_dict(key_code: str, value_code: str, mapping: dict[int, int]) -> bytes:
+    return _pack_array(key_code, mapping.keys()) + _pack_array(
+        value_code, mapping.values()
+    )
+
+
+def _unpack_array(code: str, view: memoryview, offset: int) -> tuple[tuple, int]:
+    """Unpack an array written by _pack_array; return (values, new offset)."""
+    (count,) = _COUNT.unpack_from(view, offset)
+    offset += _COUNT.size
+    fmt = f"<{count}{code}"
+    return struct.unpack_from(fmt, view, offset), offset + struct.calcsize(fmt)
+
+
+def _unpack_dict(
+    key_code: str, value_code: str, view: memoryview, offset: int
+) -> tuple[dict[int, int], int]:
+    keys, offset = _unpack_array(key_code, view, offset)
+    values, offset = _unpack_array(value_code, view, offset)
+    return dict(zip(keys, values, strict=True)), offset
+
+
+def pack_state(state: GameState) -> bytes:
+    """Serialize *state* into a snapshot blob."""
+    mask = state.visited_rooms_mask
+    mask_bytes = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    return b"".join(
+        (
+            _VERSION.pack(SNAPSHOT_VERSION),
+            _SCALARS.pack(*(getattr(state, name) for name in _SCALAR_NAMES)),
+            _pack_dict("h", "h", state.object_locations),
+            _pack_dict("h", "h", state.object_props),
+            _pack_array("h", state.dwarf_locations),
+            _pack_array("h", state.dwarf_old_locations),
+            _pack_array("?", state.dwarf_seen),
+            _pack_dict("h", "i", state.hint_turns),
+            _pack_array("h", sorted(state.hints_given)),
+            _COUNT.pack(len(mask_bytes)),
+            mask_bytes,
+        )
+    )
+
+
+def unpack_state(blob: bytes) -> GameState:
+    """Rebuild a GameState from a blob produced by pack_state.
+
+    Raises ValueError if the blob is not a snapshot this version can read.
+    """
+    view = memoryview(blob)
+    if not blob or _VERSION.unpack_from(view)[0] != SNAPSHOT_VERSION:
+        raise ValueError("unsupported game state snapshot")
+    offset = _VERSION.size
+
+    try:
+        scalars = _SCALARS.unpack_from(view, offset)
+        offset += _SCALARS.size
+        state = GameState(**dict(zip(_SCALAR_NAMES, scalars, strict=True)))
+
+        state.object_locations, offset = _unpack_dict("h", "h", view, offset)
+        state.object_props, offset = _unpack_dict("h", "h", view, offset)
+        dwarf_locations, offset = _unpack_array("h", view, offset)
+        dwarf_old_locations, offset = _unpack_array("h", view, offset)
+        dwarf_seen, offset = _unpack_array("?", view, offset)
+        state.dwarf_locations = list(dwarf_locations)
+        state.dwarf_old_locations = list(dwarf_old_locations)
+        state.dwarf_seen = list(dwarf_seen)
+        state.hint_turns, offset = _unpack_dict("h", "i", view, offset)
+        hints_given, offset = _unpack_array("h", view, offset)
+        state.hints_given = set(hints_given)
+
+        (mask_len,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        state.visited_rooms_mask = int.from_bytes(
+            view[offset : offset + mask_len], "little"
+        )
+    except struct.error as exc:
+        raise ValueError("truncated game state snapshot") from exc
+
+    return state
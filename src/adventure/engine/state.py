@@ -1,17 +1,21 @@
 """Mutable per-player game state.
 
 All values are ints/bools/sets/dicts — no World references — so this
-can be safely pickled for per-player persistence.
+can be packed into a compact snapshot (see snapshot.py) for per-player
+persistence. The one exception is the game's own random number
+generator, which is not persisted; a restored game gets a fresh one.
 """
 
-from dataclasses import dataclass, field
+import random
+from dataclasses import MISSING, dataclass, field, fields, replace
 
+# Location sentinels and CHEST live with the World so the loader can use
+# them; they are re-exported here with the other game constants.
+from .world import CARRIED as CARRIED
+from .world import CHEST as CHEST
+from .world import DESTROYED as DESTROYED
 from .world import World
 
-# Special location values for objects
-CARRIED = 0
-DESTROYED = -1
-
 # Starting room
 START_ROOM = 1
 
@@ -50,7 +54,6 @@ PLANT2 = 25
 BATTERIES = 39
 NUGGET = 50
 COINS = 54
-CHEST = 55
 EGGS = 56
 TRIDENT = 57
 
@@ -65,9 +68,12 @@ CHEST_ROOM = 64  # Dead end where pirate deposits stolen treasures
 PIRATE_MSG_ROOM = 140  # Room for pirate message/hint object
 
 
-@dataclass
+@dataclass(slots=True)
 class GameState:
-    """All mutable per-player state. Holds only primitive types."""
+    """All mutable per-player state.
+
+    Holds only primitive types, plus a per-game RNG that is not persisted.
+    """
 
     current_room: int = START_ROOM
     old_room: int = START_ROOM
@@ -94,7 +100,8 @@ class GameState:
     deaths: int = 0
     max_deaths: int = 3
 
-    visited_rooms: set[int] = field(default_factory=set)
+    # Bitset of visited rooms: bit N is set once room N has been entered
+    visited_rooms_mask: int = 0
     is_finished: bool = False
 
     # Dwarf state: stage 0=dormant, 1=armed, 2=active, 3=aggressive
@@ -132,22 +139,82 @@ class GameState:
     # Count of treasures not yet seen (prop still < 0 / not in object_props)
     treasures_not_found: int = 15
 
+    # Per-game RNG for dwarves, the pirate and other chance events
+    rng: random.Random = field(default_factory=random.Random, compare=False, repr=False)
+
     @property
     def dwarves_active(self) -> bool:
         """Backward-compatible alias: True when dwarf_stage > 0."""
         return self.dwarf_stage > 0
 
-
-def new_game_state(world: World) -> GameState:
-    """Create a fresh game state with objects in their starting positions."""
-    state = GameState()
-
-    # Place objects in their initial rooms
-    for obj_id, obj in world.objects.items():
-        if obj.initial_rooms:
-            state.object_locations[obj_id] = obj.initial_rooms[0]
-        else:
-            state.object_locations[obj_id] = DESTROYED
+    def mark_visited(self, room: int) -> None:
+        """Record that the player has entered *room*."""
+        self.visited_rooms_mask |= 1 << room
+
+    def has_visited(self, room: int) -> bool:
+        """Check whether the player has entered *room* before."""
+        return bool(self.visited_rooms_mask >> room & 1)
+
+    def teleport(self, room: int) -> None:
+        """Put the player in *room* directly, with no travel checks."""
+        self.old_room = self.current_room
+        self.current_room = room
+        self.mark_visited(room)
+
+    def __setstate__(self, state) -> None:
+        """Restore a pickled state, including one pickled before slots.
+
+        Slotted pickles carry ``(None, slot values)``; older ones carry the
+        instance ``__dict__``, with visited rooms as a ``visited_rooms`` set
+        rather than a bitset. Fields the pickle lacks keep their defaults.
+        """
+        values = state[1] if isinstance(state, tuple) else dict(state)
+        if "visited_rooms" in values:
+            mask = 0
+            for room in values.pop("visited_rooms"):
+                mask |= 1 << room
+            values["visited_rooms_mask"] = mask
+        for f in fields(self):
+            if f.name in values:
+                value = values[f.name]
+            elif f.default is not MISSING:
+                value = f.default
+            else:
+                value = f.default_factory()
+            setattr(self, f.name, value)
+
+    def copy(self) -> "GameState":
+        """Return an independent copy of this state.
+
+        Scalars are immutable and shared; each container is copied one
+        level deep, which is all it needs since they only hold ints. The
+        copy's RNG starts from the same internal state as this one's.
+        """
+        rng = random.Random()
+        rng.setstate(self.rng.getstate())
+        return replace(
+            self,
+            rng=rng,
+            object_locations=self.object_locations.copy(),
+            object_props=self.object_props.copy(),
+            dwarf_locations=self.dwarf_locations.copy(),
+            dwarf_old_locations=self.dwarf_old_locations.copy(),
+            dwarf_seen=self.dwarf_seen.copy(),
+            hint_turns=self.hint_turns.copy(),
+            hints_given=self.hints_given.copy(),
+        )
+
+
+def new_game_state(world: World, seed: int | None = None) -> GameState:
+    """Create a fresh game state with objects in their starting positions.
+
+    *seed* makes the game's random events reproducible; by default the
+    RNG is seeded from the OS.
+    """
+    state = GameState(rng=random.Random(seed))
+
+    # Place objects in their initial rooms (precomputed by the loader)
+    state.object_locations = world.initial_object_locations.copy()
 
     # Set initial object properties
     state.object_props[GRATE] = 0  # locked
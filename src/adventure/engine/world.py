@@ -5,8 +5,15 @@ These are loaded once from advent.dat at startup and shared across all players.
 
 from dataclasses import dataclass, field
 
+# Special location values for objects
+CARRIED = 0
+DESTROYED = -1
 
-@dataclass(frozen=True)
+# The pirate's treasure chest; its point value differs from other treasures
+CHEST = 55
+
+
+@dataclass(frozen=True, slots=True)
 class Move:
     """A travel table entry: verbs + condition → destination."""
 
@@ -16,7 +23,7 @@ class Move:
     is_forced: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class Room:
     """A location in the game world."""
 
@@ -24,13 +31,22 @@ class Room:
     long_description: str = ""
     short_description: str = ""
     travel_table: list[Move] = field(default_factory=list)
+    # Travel entries to try for each verb, in table order (forced ones
+    # included), and the forced entries alone for any other verb
+    travel_by_verb: dict[int, tuple[Move, ...]] = field(default_factory=dict)
+    forced_moves: tuple[Move, ...] = ()
     is_light: bool = False
     liquid: int | None = None
     is_forbidden_to_pirate: bool = False
     hint_number: int | None = None
+    # Compass exit labels ("North", "Up", ...) shown to the player
+    exits: tuple[str, ...] = ()
+    # Sorted rooms a dwarf / the pirate may wander to from here
+    dwarf_destinations: tuple[int, ...] = ()
+    pirate_destinations: tuple[int, ...] = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class Obj:
     """An object in the game world."""
 
@@ -43,7 +59,7 @@ class Obj:
     is_fixed: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Word:
     """A vocabulary word."""
 
@@ -52,7 +68,7 @@ class Word:
     number: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Hint:
     """A hint offered when the player lingers in an area."""
 
@@ -64,7 +80,7 @@ class Hint:
     rooms: list[int] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class World:
     """The complete immutable game world, loaded from advent.dat."""
 
@@ -76,3 +92,13 @@ class World:
     hints: dict[int, Hint] = field(default_factory=dict)
     magic_messages: dict[int, str] = field(default_factory=dict)
     object_names: dict[str, int] = field(default_factory=dict)
+    # Input word (as typed, truncated to 5 letters) → motion verb number
+    motion_verbs: dict[str, int] = field(default_factory=dict)
+    # 5-letter name → every object answering to it, in object order
+    object_ids_by_name: dict[str, tuple[int, ...]] = field(default_factory=dict)
+    # obj_id → starting room (-1 for objects that start out of play)
+    initial_object_locations: dict[int, int] = field(default_factory=dict)
+    # Object numbers of every treasure, ascending
+    treasure_ids: tuple[int, ...] = ()
+    # treasure obj_id → points for storing it in the building
+    treasure_values: dict[int, int] = field(default_factory=dict)
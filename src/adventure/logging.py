@@ -1,12 +1,21 @@
 """Logging configuration for Adventure."""
 
+import atexit
 import hashlib
+import logging
 import sys
+from collections.abc import Callable
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from queue import SimpleQueue
 from typing import Any
 
 import structlog
 
+# Log file rotation: roll over at 10 MiB, keep 5 old files
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+
 
 def hash_fingerprint_processor(
     logger: Any, method_name: str, event_dict: dict[str, Any]
@@ -21,15 +30,64 @@ def hash_fingerprint_processor(
     return event_dict
 
 
+_LEVELS = {
+    "DEBUG": 10,
+    "INFO": 20,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+
+
 def _level_to_int(level: str) -> int:
-    levels = {
-        "DEBUG": 10,
-        "INFO": 20,
-        "WARNING": 30,
-        "ERROR": 40,
-        "CRITICAL": 50,
-    }
-    return levels.get(level.upper(), 20)
+    return _LEVELS.get(level.upper(), 20)
+
+
+# Background thread writing file logs; replaced when logging is reconfigured
+_listener: QueueListener | None = None
+
+
+def _stop_listener() -> None:
+    """Drain and stop the file-log thread, if any, and close its file."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(_stop_listener)
+
+
+def _file_logger_factory(log_file: Path) -> Callable[..., logging.Logger]:
+    """Route rendered log lines to a rotating file via a background thread.
+
+    Request handlers only enqueue the rendered line; the QueueListener
+    thread does the file writes and flushes off the request path. Any
+    listener from an earlier call is stopped first, so reconfiguring
+    logging never leaves a thread behind.
+    """
+    global _listener
+    _stop_listener()
+    file_handler = RotatingFileHandler(
+        log_file,
+        maxBytes=LOG_FILE_MAX_BYTES,
+        backupCount=LOG_FILE_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+    queue: SimpleQueue = SimpleQueue()
+    _listener = QueueListener(queue, file_handler)
+    _listener.start()
+
+    # Level filtering happens in structlog; the stdlib logger passes everything
+    stdlib_logger = logging.getLogger("adventure")
+    stdlib_logger.handlers = [QueueHandler(queue)]
+    stdlib_logger.setLevel(logging.DEBUG)
+    stdlib_logger.propagate = False
+
+    return lambda *args: stdlib_logger
 
 
 def configure_logging(
@@ -40,9 +98,11 @@ def configure_logging(
 ) -> None:
     """Configure structured logging for the application."""
     if log_file:
-        output_stream = open(log_file, "a")
+        logger_factory: Any = _file_logger_factory(log_file)
+        use_colors = False
     else:
-        output_stream = sys.stdout
+        logger_factory = structlog.PrintLoggerFactory(file=sys.stdout)
+        use_colors = sys.stdout.isatty()
 
     base_processors: list[Any] = [
         structlog.contextvars.merge_contextvars,
@@ -59,14 +119,14 @@ def configure_logging(
         processors = base_processors + [structlog.processors.JSONRenderer()]
     else:
         processors = base_processors + [
-            structlog.dev.ConsoleRenderer(colors=output_stream.isatty())
+            structlog.dev.ConsoleRenderer(colors=use_colors)
         ]
 
     structlog.configure(
         processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(_level_to_int(log_level)),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(file=output_stream),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
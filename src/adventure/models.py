@@ -15,7 +15,7 @@ class Player(SQLModel, table=True):
 class SavedGame(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
     player_id: int = Field(foreign_key="player.id", unique=True, index=True)
-    state_blob: bytes  # zlib-compressed pickle of GameState
+    state_blob: bytes  # GameState snapshot (see engine/snapshot.py)
     turns: int = 0
     score: int = 0
     is_finished: bool = False
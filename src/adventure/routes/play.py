@@ -12,7 +12,11 @@ from ..users import get_or_create_player
 
 @contextmanager
 def _game_session(request: Request):
-    """Load the player's game session with auto-close."""
+    """Load the player's game session in a single transaction.
+
+    Everything the request writes (player upsert, saved game) is committed
+    once on exit, or rolled back if the handler raises.
+    """
     identity = get_identity(request)
     db_session = Session(request.app.state.engine)
     try:
@@ -26,6 +30,10 @@ def _game_session(request: Request):
             player,
             world,
         )
+        db_session.commit()
+    except Exception:
+        db_session.rollback()
+        raise
     finally:
         db_session.close()
 
@@ -1,6 +1,7 @@
 """Session layer bridging the game engine and database."""
 
 import datetime as dt
+import io
 import pickle
 import zlib
 
@@ -14,6 +15,7 @@ from .engine.commands import (
     get_visible_objects,
     handle_command,
 )
+from .engine.snapshot import SNAPSHOT_VERSION, pack_state, unpack_state
 from .engine.state import GameState, new_game_state
 from .engine.world import World
 from .logging import get_logger
@@ -21,6 +23,62 @@ from .models import Player, SavedGame
 
 logger = get_logger(__name__)
 
+_SNAPSHOT_HEADER = bytes((SNAPSHOT_VERSION,))
+
+
+def serialize_state(state: GameState) -> bytes:
+    """Encode a GameState as a blob for SavedGame.state_blob.
+
+    Snapshots are a few hundred bytes, so they are stored uncompressed.
+    """
+    return pack_state(state)
+
+
+def deserialize_state(blob: bytes) -> GameState:
+    """Decode a SavedGame.state_blob produced by serialize_state.
+
+    Saves written before snapshots (zlib-compressed pickles) are still
+    read. Raises ValueError if the blob is corrupt.
+    """
+    if _is_snapshot(blob):
+        return unpack_state(blob)
+    return _load_legacy_state(blob)
+
+
+def _is_snapshot(blob: bytes) -> bool:
+    return blob[:1] == _SNAPSHOT_HEADER
+
+
+class _LegacySaveUnpickler(pickle.Unpickler):
+    """Unpickler for pre-snapshot saves that only ever rebuilds a GameState."""
+
+    def find_class(self, module: str, name: str):
+        if module == GameState.__module__ and name == GameState.__name__:
+            return GameState
+        raise pickle.UnpicklingError(f"unexpected global in save: {module}.{name}")
+
+
+def _load_legacy_state(blob: bytes) -> GameState:
+    """Read a zlib-compressed pickled GameState from before snapshots.
+
+    GameState.__setstate__ maps the old dict-backed layout onto the
+    current fields.
+    """
+    try:
+        state = _LegacySaveUnpickler(io.BytesIO(zlib.decompress(blob))).load()
+    except Exception as exc:
+        raise ValueError("unreadable legacy game state save") from exc
+    if not isinstance(state, GameState):
+        raise ValueError("legacy save does not hold a game state")
+    return state
+
+
+def _fresh_state(world: World) -> GameState:
+    """Create a new game with its starting score filled in."""
+    state = new_game_state(world)
+    state.score = calculate_score(world, state)
+    return state
+
 
 class AdventureSession:
     """Wraps a Player + SavedGame + in-memory GameState."""
@@ -50,29 +108,49 @@ class AdventureSession:
         statement = select(SavedGame).where(SavedGame.player_id == player.id)
         saved_game = db_session.exec(statement).first()
 
+        migrate = False
         if saved_game and not saved_game.is_finished:
-            game_state = pickle.loads(zlib.decompress(saved_game.state_blob))
-            logger.debug(
-                "game_loaded",
-                fingerprint=player.fingerprint,
-                turns=saved_game.turns,
-            )
+            try:
+                game_state = deserialize_state(saved_game.state_blob)
+            except ValueError:
+                # A corrupt save can't be restored; start over and
+                # overwrite the existing row on the next save.
+                game_state = _fresh_state(world)
+                logger.warning(
+                    "saved_game_unreadable",
+                    fingerprint=player.fingerprint,
+                )
+            else:
+                # Pre-snapshot saves never stored the score; rescore them
+                # and rewrite the row as a snapshot below.
+                if not _is_snapshot(saved_game.state_blob):
+                    game_state.score = calculate_score(world, game_state)
+                    migrate = True
+                logger.debug(
+                    "game_loaded",
+                    fingerprint=player.fingerprint,
+                    turns=saved_game.turns,
+                )
         else:
-            game_state = new_game_state(world)
+            game_state = _fresh_state(world)
             saved_game = None
             logger.info("new_game_started", fingerprint=player.fingerprint)
 
-        return cls(db_session, player, saved_game, game_state, world)
+        session = cls(db_session, player, saved_game, game_state, world)
+        if migrate:
+            session.save()
+            logger.info("saved_game_migrated", fingerprint=player.fingerprint)
+        return session
 
     def process_command(self, raw_input: str) -> str:
         """Delegate to the engine and return response text."""
         return handle_command(self.world, self.state, raw_input)
 
     def save(self) -> None:
-        """Serialize state back to the database."""
+        """Serialize state into the current transaction (caller commits)."""
         now = dt.datetime.now(dt.UTC)
-        blob = zlib.compress(pickle.dumps(self.state))
-        score = calculate_score(self.world, self.state)
+        blob = serialize_state(self.state)
+        score = self.state.score
 
         if self.saved_game is None:
             self.saved_game = SavedGame(
@@ -92,7 +170,6 @@ class AdventureSession:
             self.saved_game.is_finished = self.state.is_finished
             self.saved_game.last_played = now
 
-        self.db_session.commit()
         logger.debug(
             "game_saved",
             fingerprint=self.player.fingerprint,
@@ -114,9 +191,11 @@ class AdventureSession:
 
     def reset(self) -> None:
         """Reset to a fresh game."""
-        self.state = new_game_state(self.world)
+        self.state = _fresh_state(self.world)
         if self.saved_game:
             self.db_session.delete(self.saved_game)
-            self.db_session.commit()
+            # Flush the DELETE now so a following save() can INSERT a new
+            # row for this player without tripping the unique constraint.
+            self.db_session.flush()
             self.saved_game = None
         logger.info("game_reset", fingerprint=self.player.fingerprint)
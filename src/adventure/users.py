@@ -23,6 +23,7 @@ def get_or_create_player(session: Session, fingerprint: str) -> Player:
         session.add(player)
         logger.info("player_created", fingerprint=fingerprint)
 
-    session.commit()
-    session.refresh(player)
+    # Flush (not commit) so player.id is assigned; the caller owns the
+    # transaction and commits once per request.
+    session.flush()
     return player
@@ -8,15 +8,42 @@ from sqlmodel import Session, SQLModel, create_engine
 from adventure.app import _get_data_path, create_app
 from adventure.config import Config
 from adventure.engine.loader import load_world
+from adventure.engine.state import GameState, new_game_state
 from adventure.engine.world import World
 from adventure.models import Player
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def world() -> World:
+    """Parse advent.dat once; tests and the engine only read the World."""
     return load_world(_get_data_path())
 
 
+@pytest.fixture(scope="session")
+def any_hint(world: World) -> tuple[int, int]:
+    """(hint number, penalty) of the first hint in the world."""
+    hint_n = next(iter(world.hints))
+    return hint_n, world.hints[hint_n].penalty
+
+
+@pytest.fixture
+def seed() -> int:
+    """RNG seed for the state fixture; a test module may override it."""
+    return 0
+
+
+@pytest.fixture
+def state(world: World, seed: int) -> GameState:
+    """A fresh game per test (a dict copy of the world's starting layout).
+
+    Seeded, so any chance event a test happens to trigger plays out the
+    same way on every run. Built fresh rather than copied from a cached
+    base state: new_game_state is a single dict copy, several times
+    cheaper than GameState.copy(), which has to clone the RNG.
+    """
+    return new_game_state(world, seed=seed)
+
+
 @pytest.fixture
 def db_engine(tmp_path: Path):
     db_url = f"sqlite:///{tmp_path}/test.db"
@@ -46,8 +73,8 @@ def test_config(tmp_path: Path) -> Config:
 
 
 @pytest.fixture
-def app(test_config: Config):
-    return create_app(test_config)
+def app(test_config: Config, world: World):
+    return create_app(test_config, world)
 
 
 @pytest.fixture
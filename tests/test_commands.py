@@ -1,11 +1,25 @@
 """Tests for the command engine."""
 
+import random
+from unittest.mock import patch
+
+import pytest
+
 from adventure.engine.commands import (
+    _move_to,
+    _start_closing,
+    _tick_dwarves,
+    _tick_pirate,
+    advance_until,
     calculate_score,
+    drop_all_carried,
+    drop_object,
     get_exits,
     get_room_description,
     get_visible_objects,
     handle_command,
+    handle_commands,
+    parse_command,
 )
 from adventure.engine.state import (
     AXE,
@@ -18,40 +32,37 @@ from adventure.engine.state import (
     LAMP,
     MAGAZINE,
     NUGGET,
-    new_game_state,
+    ROD2,
+    GameState,
 )
 from adventure.engine.world import World
 
 
-def test_look(world: World):
+def test_look(world: World, state: GameState):
     """LOOK returns room description."""
-    state = new_game_state(world)
     result = handle_command(world, state, "look")
     assert "ROAD" in result.upper() or "BUILDING" in result.upper()
 
 
-def test_inventory_empty(world: World):
+def test_inventory_empty(world: World, state: GameState):
     """INVENTORY when not carrying anything."""
-    state = new_game_state(world)
     result = handle_command(world, state, "inventory")
     assert "not carrying" in result.lower()
 
 
-def test_take_keys(world: World):
+def test_take_keys(world: World, state: GameState):
     """TAKE KEYS picks up the keys."""
-    state = new_game_state(world)
     # Keys start at room 3 (building), move player there
     state.current_room = 3
-    state.visited_rooms.add(3)
+    state.mark_visited(3)
     state.object_locations[LAMP] = CARRIED
     state.lamp_on = True
     result = handle_command(world, state, "take keys")
     assert state.object_locations[KEYS] == CARRIED or "OK" in result
 
 
-def test_go_direction(world: World):
+def test_go_direction(world: World, state: GameState):
     """Going a valid direction moves the player."""
-    state = new_game_state(world)
     old_room = state.current_room
     handle_command(world, state, "south")
     # Player should have moved (or gotten a message)
@@ -59,23 +70,20 @@ def test_go_direction(world: World):
     assert state.current_room != old_room or state.turns > 0
 
 
-def test_score(world: World):
+def test_score(world: World, state: GameState):
     """SCORE returns score info."""
-    state = new_game_state(world)
     result = handle_command(world, state, "score")
     assert "score" in result.lower()
 
 
-def test_help(world: World):
+def test_help(world: World, state: GameState):
     """HELP returns help text."""
-    state = new_game_state(world)
     result = handle_command(world, state, "help")
     assert "vocabulary" in result.lower() or "know" in result.lower()
 
 
-def test_get_exits(world: World):
+def test_get_exits(world: World, state: GameState):
     """get_exits returns direction names."""
-    state = new_game_state(world)
     exits = get_exits(world, state)
     assert len(exits) > 0
     # Room 1 should have multiple exits
@@ -83,40 +91,106 @@ def test_get_exits(world: World):
     assert len(directions) > 0
 
 
-def test_get_room_description(world: World):
+def test_get_room_description(world: World, state: GameState):
     """get_room_description returns room text."""
-    state = new_game_state(world)
     desc = get_room_description(world, state)
     assert len(desc) > 0
 
 
-def test_get_visible_objects(world: World):
+def test_revisited_room_uses_short_description(world: World, state: GameState):
+    """Entering a room marks it visited, so coming back shows the short text."""
+    handle_command(world, state, "in")
+    assert state.has_visited(3)
+    handle_command(world, state, "out")
+    handle_command(world, state, "in")
+    assert get_room_description(world, state) == world.rooms[3].short_description
+
+
+def test_get_visible_objects(world: World, state: GameState):
     """get_visible_objects finds objects in room."""
-    state = new_game_state(world)
     state.current_room = 3  # building has objects
     objects = get_visible_objects(world, state)
     # Building should have keys, lamp, food, bottle
     assert len(objects) > 0
 
 
-def test_unknown_command(world: World):
+def test_unknown_command(world: World, state: GameState):
     """Unknown command gives error message."""
-    state = new_game_state(world)
     result = handle_command(world, state, "xyzflurble")
     assert "don't understand" in result.lower() or "don't know" in result.lower()
 
 
-def test_quit(world: World):
+def test_parse_command():
+    """Input is lowercased and truncated to significant word length."""
+    assert parse_command("  Get LANTERN now ") == ("get", "lante")
+    assert parse_command("xyzzy") == ("xyzzy", None)
+    assert parse_command("   ") is None
+
+
+def test_blank_input_takes_a_turn(world: World, state: GameState):
+    """Blank input still advances the turn counter."""
+    assert handle_command(world, state, "") == "I beg your pardon?"
+    assert state.turns == 1
+
+
+def test_quit(world: World, state: GameState):
     """QUIT ends the game."""
-    state = new_game_state(world)
     result = handle_command(world, state, "quit")
     assert state.is_finished
     assert "score" in result.lower()
 
 
-def test_open_grate_with_keys(world: World):
+def test_handle_commands_stops_when_finished(world: World, state: GameState):
+    """A batch stops at the command that ends the game and rescores once."""
+    responses = handle_commands(world, state, ["in", "quit", "out"])
+    assert len(responses) == 2
+    assert state.current_room == 3
+    assert state.score == calculate_score(world, state)
+
+
+def test_advance_until(world: World, state: GameState):
+    """Commands cycle until the predicate holds, capped at max_turns."""
+    assert advance_until(world, state, lambda s: s.turns >= 3, ("in", "out")) == 3
+    assert state.current_room == 3
+    assert advance_until(world, state, lambda s: False, ("look",), max_turns=2) == 2
+    assert state.turns == 5
+
+
+def test_drop_object(world: World, state: GameState):
+    """Dropping by object number leaves it here without taking a turn."""
+    state.object_locations[KEYS] = CARRIED
+    assert drop_object(world, state, KEYS) == "OK."
+    assert state.object_locations[KEYS] == state.current_room
+    assert drop_object(world, state, KEYS) == "You aren't carrying it!"
+    assert state.turns == 0
+
+
+def test_drop_object_keeps_score_current(world: World, state: GameState):
+    """A treasure dropped in the building counts toward state.score at once."""
+    state.current_room = 3
+    state.object_locations[NUGGET] = CARRIED
+    state.object_props[NUGGET] = 0
+    before = calculate_score(world, state)
+
+    drop_object(world, state, NUGGET)
+    assert state.score == calculate_score(world, state) > before
+
+    state.object_locations[NUGGET] = CARRIED
+    drop_all_carried(world, state, [NUGGET])
+    assert state.score == calculate_score(world, state) > before
+
+
+def test_drop_all_carried(world: World, state: GameState):
+    """Only candidates the player carries are dropped."""
+    state.object_locations[KEYS] = CARRIED
+    state.object_locations[LAMP] = CARRIED
+    assert drop_all_carried(world, state, [KEYS, AXE]) == ["OK."]
+    assert state.object_locations[KEYS] == state.current_room
+    assert state.object_locations[LAMP] == CARRIED
+
+
+def test_open_grate_with_keys(world: World, state: GameState):
     """Opening grate with keys works."""
-    state = new_game_state(world)
     state.current_room = 8  # depression with grate
     state.object_locations[KEYS] = CARRIED
     state.object_locations[LAMP] = CARRIED
@@ -125,36 +199,42 @@ def test_open_grate_with_keys(world: World):
     assert state.object_props.get(GRATE) == 1 or "no keys" in result.lower()
 
 
+def test_take_resolves_shared_name(world: World, state: GameState):
+    """A name shared by two objects resolves to the one that is here."""
+    state.current_room = 115
+    state.object_locations[LAMP] = CARRIED
+    state.lamp_on = True
+    state.object_locations[ROD2] = 115
+    handle_command(world, state, "get rod")
+    assert state.object_locations[ROD2] == CARRIED
+
+
 # --- Scoring tests ---
 
 
-def test_score_base(world: World):
+def test_score_base(world: World, state: GameState):
     """Fresh game has base score: 2 (base) + 30 (survival) + 4 (not quit)."""
-    state = new_game_state(world)
     assert calculate_score(world, state) == 36
 
 
-def test_score_treasure_found(world: World):
+def test_score_treasure_found(world: World, state: GameState):
     """Finding a treasure (setting its prop) gives 2 points."""
-    state = new_game_state(world)
     # Gold nugget (obj 50) — worth 12 total, 2 for finding
     state.object_props[50] = 0
     score = calculate_score(world, state)
     assert score == 36 + 2
 
 
-def test_score_treasure_stored(world: World):
+def test_score_treasure_stored(world: World, state: GameState):
     """Storing a treasure at building (room 3) with prop 0 gives full value."""
-    state = new_game_state(world)
     # Gold nugget (obj 50) — value 12 (< CHEST)
     state.object_locations[50] = 3
     state.object_props[50] = 0
     assert calculate_score(world, state) == 36 + 12
 
 
-def test_score_treasure_values(world: World):
+def test_score_treasure_values(world: World, state: GameState):
     """Treasures below/at/above CHEST have different point values."""
-    state = new_game_state(world)
 
     # Below CHEST (obj 50-54): value 12 each
     state.object_locations[50] = 3  # gold
@@ -175,9 +255,8 @@ def test_score_treasure_values(world: World):
     assert score_eggs == 16
 
 
-def test_score_survival_bonus(world: World):
+def test_score_survival_bonus(world: World, state: GameState):
     """Each death costs 10 points from survival bonus."""
-    state = new_game_state(world)
     base = calculate_score(world, state)
 
     state.deaths = 1
@@ -187,90 +266,100 @@ def test_score_survival_bonus(world: World):
     assert calculate_score(world, state) == base - 30
 
 
-def test_score_quit_penalty(world: World):
+def test_score_quit_penalty(world: World, state: GameState):
     """Quitting costs 4 points."""
-    state = new_game_state(world)
     base = calculate_score(world, state)
     state.gave_up = True
     assert calculate_score(world, state) == base - 4
 
 
-def test_score_dwarves_bonus(world: World):
-    """Activating dwarves gives 25 points."""
-    state = new_game_state(world)
+@pytest.mark.parametrize("stage", [1, 2, 3])
+def test_score_dwarves_bonus(world: World, state: GameState, stage: int):
+    """Activating dwarves (any stage, via the dwarves_active alias) gives 25."""
     base = calculate_score(world, state)
-    state.dwarf_stage = 1
+    state.dwarf_stage = stage
+    assert state.dwarves_active
     assert calculate_score(world, state) == base + 25
 
 
-def test_score_closing_bonus(world: World):
+def test_score_closing_bonus(world: World, state: GameState):
     """Cave closing gives 25 points."""
-    state = new_game_state(world)
     base = calculate_score(world, state)
     state.is_closing = True
     assert calculate_score(world, state) == base + 25
 
 
-def test_score_closed_and_blast(world: World):
+@pytest.mark.parametrize(
+    ("bonus", "expected"),
+    [
+        (133, 45),  # max bonus
+        (134, 30),  # medium bonus
+        (135, 25),  # min bonus
+        (0, 10),  # no blast
+    ],
+)
+def test_score_closed_and_blast(
+    world: World, state: GameState, bonus: int, expected: int
+):
     """Cave closed gives 25 + bonus points based on blast location."""
-    state = new_game_state(world)
     base = calculate_score(world, state)
-
     state.is_closed = True
-    state.bonus = 133  # max bonus (45 pts)
-    assert calculate_score(world, state) == base + 25 + 45
+    state.bonus = bonus
+    assert calculate_score(world, state) == base + 25 + expected
 
-    state.bonus = 134  # medium bonus (30 pts)
-    assert calculate_score(world, state) == base + 25 + 30
 
-    state.bonus = 135  # min bonus (25 pts)
-    assert calculate_score(world, state) == base + 25 + 25
-
-    state.bonus = 0  # no blast (10 pts)
-    assert calculate_score(world, state) == base + 25 + 10
-
-
-def test_score_magazine_bonus(world: World):
+def test_score_magazine_bonus(world: World, state: GameState):
     """Magazine at Witt's End (room 108) gives 1 point."""
-    state = new_game_state(world)
     base = calculate_score(world, state)
     state.object_locations[MAGAZINE] = 108
     assert calculate_score(world, state) == base + 1
 
 
-def test_score_hint_penalty(world: World):
+def test_score_hint_penalty(world: World, state: GameState, any_hint: tuple[int, int]):
     """Using hints deducts their penalty from score."""
-    state = new_game_state(world)
+    hint_n, penalty = any_hint
     base = calculate_score(world, state)
-    # Add a hint with known penalty
-    hint_n = next(iter(world.hints))
-    penalty = world.hints[hint_n].penalty
     state.hints_given.add(hint_n)
     assert calculate_score(world, state) == base - penalty
 
 
+def test_score_tracked_on_state(world: World, state: GameState):
+    """handle_command keeps state.score in sync with calculate_score."""
+    handle_command(world, state, "look")
+    assert state.score == calculate_score(world, state)
+
+    handle_command(world, state, "quit")
+    assert state.score == calculate_score(world, state)
+
+
 # --- Dwarf / pirate AI tests ---
 
 
+# Seed whose first random() is < 0.95, so entering the deep cave neither
+# triggers the first dwarf encounter nor (with a lit lamp) a dark death.
+QUIET_SEED = 42
+
+
+def test_quiet_seed_invariant():
+    """QUIET_SEED still satisfies the property the dwarf tests rely on."""
+    assert random.Random(QUIET_SEED).random() < 0.95
+
+
 def _enter_deep_cave(world, state):
     """Move player into deep cave (room 15+) to activate dwarf stage."""
     state.current_room = 15
     state.old_room = 15
-    state.visited_rooms.add(15)
+    state.mark_visited(15)
     state.lamp_on = True
     state.object_props[LAMP] = 1
     state.object_locations[LAMP] = CARRIED
 
 
-def test_dwarf_stage_activation(world: World):
+def test_dwarf_stage_activation(world: World, state: GameState):
     """Entering room >= 15 activates dwarf stage 0 → 1."""
-    import random as _random
-
-    state = new_game_state(world)
     assert state.dwarf_stage == 0
 
-    # Seed random to avoid dark-death and first-encounter rolls
-    _random.seed(42)
+    state.rng.seed(QUIET_SEED)
     state.object_locations[LAMP] = CARRIED
     state.lamp_on = True
     state.object_props[LAMP] = 1
@@ -278,44 +367,25 @@ def test_dwarf_stage_activation(world: World):
     state.old_room = 14
 
     # Move to room 15 via _move_to (through handle_command w/ motion word)
-    from adventure.engine.commands import _move_to
-
     _move_to(world, state, 15)
     assert state.dwarf_stage == 1
 
 
-def test_dwarf_first_encounter(world: World):
+def test_dwarf_first_encounter(world: World, state: GameState):
     """Stage 1 → 2 transition drops axe and shows message."""
-    import random as _random
-
-    state = new_game_state(world)
     _enter_deep_cave(world, state)
     state.dwarf_stage = 1
 
-    # Seed so that random() >= 0.95 triggers encounter
-    _random.seed(0)
-    # Find a seed where random() >= 0.95
-    for seed in range(1000):
-        _random.seed(seed)
-        if _random.random() >= 0.95:
-            # Re-seed and run the tick
-            _random.seed(seed)
-            from adventure.engine.commands import _tick_dwarves
-
-            result = _tick_dwarves(world, state)
-            assert result is not None
-            assert state.dwarf_stage == 2
-            assert state.object_locations[AXE] == state.current_room
-            break
-    else:
-        raise AssertionError("Could not find seed for first encounter")
-
-
-def test_axe_throw_kills_dwarf(world: World):
-    """Throwing axe at dwarf with lucky roll kills it."""
-    from unittest.mock import patch
+    # random() >= 0.95 triggers the encounter (and never thins the pack)
+    with patch.object(state.rng, "random", return_value=0.99):
+        result = _tick_dwarves(world, state)
+    assert result is not None
+    assert state.dwarf_stage == 2
+    assert state.object_locations[AXE] == state.current_room
+
 
-    state = new_game_state(world)
+def test_axe_throw_kills_dwarf(world: World, state: GameState):
+    """Throwing axe at dwarf with lucky roll kills it."""
     _enter_deep_cave(world, state)
     state.dwarf_stage = 2
 
@@ -325,23 +395,17 @@ def test_axe_throw_kills_dwarf(world: World):
     state.dwarf_seen = [True]
     state.object_locations[AXE] = CARRIED
 
-    # random.choice is called twice: first to pick target index,
+    # choice is called twice: first to pick target index,
     # then to roll kill/miss. Side effect returns index 0, then True.
-    with patch(
-        "adventure.engine.commands.random.choice",
-        side_effect=[0, True],
-    ):
+    with patch.object(state.rng, "choice", side_effect=[0, True]):
         result = handle_command(world, state, "throw axe")
     assert state.dwarf_killed == 1
     assert len(state.dwarf_locations) == 0
     assert "KILLED" in result.upper() or "killed" in result.lower()
 
 
-def test_axe_throw_misses_dwarf(world: World):
+def test_axe_throw_misses_dwarf(world: World, state: GameState):
     """Throwing axe at dwarf with unlucky roll misses."""
-    from unittest.mock import patch
-
-    state = new_game_state(world)
     _enter_deep_cave(world, state)
     state.dwarf_stage = 2
 
@@ -350,19 +414,15 @@ def test_axe_throw_misses_dwarf(world: World):
     state.dwarf_seen = [True]
     state.object_locations[AXE] = CARRIED
 
-    with patch(
-        "adventure.engine.commands.random.choice",
-        side_effect=[0, False],
-    ):
+    with patch.object(state.rng, "choice", side_effect=[0, False]):
         result = handle_command(world, state, "throw axe")
     assert state.dwarf_killed == 0
     assert len(state.dwarf_locations) == 1
     assert "DODGE" in result.upper() or "dodge" in result.lower()
 
 
-def test_pirate_steals_treasure(world: World):
+def test_pirate_steals_treasure(world: World, state: GameState):
     """Pirate steals carried treasures to chest room."""
-    state = new_game_state(world)
     _enter_deep_cave(world, state)
     state.dwarf_stage = 2
     state.dwarf_locations = []
@@ -377,8 +437,6 @@ def test_pirate_steals_treasure(world: World):
     # Give player a treasure (gold nugget)
     state.object_locations[NUGGET] = CARRIED
 
-    from adventure.engine.commands import _tick_pirate
-
     parts: list[str] = []
     _tick_pirate(world, state, parts)
 
@@ -391,7 +449,7 @@ def test_pirate_steals_treasure(world: World):
     state.pirate_location = 0  # disable pirate so it doesn't interfere
     state.current_room = CHEST_ROOM
     state.old_room = CHEST_ROOM
-    state.visited_rooms.add(CHEST_ROOM)
+    state.mark_visited(CHEST_ROOM)
 
     result = handle_command(world, state, "get chest")
     assert state.object_locations[CHEST] == CARRIED
@@ -400,17 +458,14 @@ def test_pirate_steals_treasure(world: World):
     assert state.object_locations[NUGGET] == CARRIED
 
 
-def test_dwarves_cleared_on_closing(world: World):
+def test_dwarves_cleared_on_closing(world: World, state: GameState):
     """Cave closing removes all dwarves and pirate."""
-    state = new_game_state(world)
     state.dwarf_stage = 2
     state.dwarf_locations = [19, 27, 33]
     state.dwarf_old_locations = [19, 27, 33]
     state.dwarf_seen = [False, False, False]
     state.pirate_location = 64
 
-    from adventure.engine.commands import _start_closing
-
     _start_closing(world, state)
 
     assert state.dwarf_locations == []
@@ -419,9 +474,8 @@ def test_dwarves_cleared_on_closing(world: World):
     assert state.pirate_location == 0
 
 
-def test_attack_dwarf_bare_hands(world: World):
+def test_attack_dwarf_bare_hands(world: World, state: GameState):
     """Attacking a dwarf bare-handed fails."""
-    state = new_game_state(world)
     _enter_deep_cave(world, state)
     state.dwarf_stage = 2
     state.dwarf_locations = []
@@ -435,9 +489,8 @@ def test_attack_dwarf_bare_hands(world: World):
     assert "bare hands" in result.lower()
 
 
-def test_feed_dwarf(world: World):
+def test_feed_dwarf(world: World, state: GameState):
     """Feeding a dwarf gives the coal message."""
-    state = new_game_state(world)
     _enter_deep_cave(world, state)
     state.dwarf_stage = 2
     state.dwarf_locations = []
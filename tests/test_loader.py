@@ -73,3 +73,57 @@ def test_treasure_flag(world: World):
     for obj_id, obj in world.objects.items():
         if isinstance(obj_id, int) and obj_id >= 50:
             assert obj.is_treasure
+
+
+def test_initial_object_locations(world: World):
+    """Starting rooms are precomputed for every object."""
+    assert world.initial_object_locations.keys() == world.objects.keys()
+    assert world.initial_object_locations[2] == world.objects[2].initial_rooms[0]
+    # Water (obj 21) has no starting room and begins out of play
+    assert world.initial_object_locations[21] == -1
+
+
+def test_room_exits_precomputed(world: World):
+    """Compass exits and trimmed descriptions are built at load time."""
+    room_1 = world.rooms[1]
+    assert "South" in room_1.exits
+    assert len(room_1.exits) == len(set(room_1.exits))
+    assert room_1.long_description == room_1.long_description.strip()
+
+
+def test_wander_routes(world: World):
+    """Dwarf and pirate routes stay in the deep cave and skip pirate-free rooms."""
+    for room in world.rooms.values():
+        assert list(room.dwarf_destinations) == sorted(set(room.dwarf_destinations))
+        assert all(15 <= dest <= 300 for dest in room.dwarf_destinations)
+        assert room.number not in room.dwarf_destinations
+        assert set(room.pirate_destinations) <= set(room.dwarf_destinations)
+        for dest in room.pirate_destinations:
+            assert not world.rooms[dest].is_forbidden_to_pirate
+
+
+def test_treasure_values(world: World):
+    """All 15 treasures get a stored value; together they are worth 218."""
+    assert world.treasure_ids == tuple(range(50, 65))
+    assert len(world.treasure_values) == 15
+    assert world.treasure_values[50] == 12
+    assert world.treasure_values[55] == 14
+    assert world.treasure_values[56] == 16
+    assert sum(world.treasure_values.values()) == 218
+
+
+def test_travel_index(world: World):
+    """The per-verb index keeps exactly the moves a table walk would try."""
+    for room in world.rooms.values():
+        assert room.forced_moves == tuple(m for m in room.travel_table if m.is_forced)
+        for verb_n, moves in room.travel_by_verb.items():
+            assert moves == tuple(
+                m for m in room.travel_table if m.is_forced or verb_n in m.verbs
+            )
+
+
+def test_motion_verbs(world: World):
+    """Motion words resolve directly, including truncated long words."""
+    assert world.motion_verbs["plove"] == world.vocabulary["plover"].number
+    assert world.motion_verbs["n"] == world.vocabulary["n"].number
+    assert "get" not in world.motion_verbs
@@ -0,0 +1,50 @@
+"""Tests for logging configuration."""
+
+import logging
+import threading
+from pathlib import Path
+
+import pytest
+import structlog
+
+from adventure import logging as adventure_logging
+from adventure.logging import configure_logging
+
+
+@pytest.fixture
+def restore_logging():
+    """Undo file logging so later tests log to stdout as before."""
+    yield
+    adventure_logging._stop_listener()
+    stdlib_logger = logging.getLogger("adventure")
+    stdlib_logger.handlers = []
+    stdlib_logger.propagate = True
+    structlog.reset_defaults()
+
+
+def test_file_logging_writes_through_listener(tmp_path: Path, restore_logging):
+    """Events logged to a file reach it once the listener is stopped."""
+    log_file = tmp_path / "adventure.log"
+    configure_logging(log_file=log_file, json_logs=True)
+
+    structlog.get_logger("test").info("file_event", fingerprint="abc")
+    listener = adventure_logging._listener
+    assert listener is not None
+    listener.stop()
+
+    contents = log_file.read_text(encoding="utf-8")
+    assert '"event": "file_event"' in contents
+    assert "abc" not in contents
+
+
+def test_reconfiguring_replaces_listener(tmp_path: Path, restore_logging):
+    """Configuring file logging twice leaves only one listener thread."""
+    configure_logging(log_file=tmp_path / "first.log")
+    first = adventure_logging._listener
+    threads = threading.active_count()
+
+    configure_logging(log_file=tmp_path / "second.log")
+
+    assert adventure_logging._listener is not first
+    assert first._thread is None
+    assert threading.active_count() == threads
@@ -85,3 +85,22 @@ def test_look_route(auth_client):
     """The /look route works."""
     response = auth_client.get("/look")
     assert response.is_success
+
+
+def test_new_game_confirmed(auth_client):
+    """Confirming /new replaces the existing save within one request."""
+    auth_client.get("/go/south")
+    response = auth_client.get_input("/new", "YES")
+    assert response.is_success
+    assert "new adventure" in response.body.lower()
+    response = auth_client.get("/play")
+    assert "ROAD" in response.body.upper()
+
+
+def test_sqlite_uses_wal(app):
+    """The app's SQLite engine runs in WAL mode with relaxed syncing."""
+    with app.state.engine.connect() as conn:
+        journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+        synchronous = conn.exec_driver_sql("PRAGMA synchronous").scalar()
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
@@ -2,9 +2,30 @@
 
 import pickle
 import zlib
+from dataclasses import fields
+from pathlib import Path
 
-from adventure.engine.state import CARRIED, KEYS, LAMP, START_ROOM, new_game_state
+import pytest
+from sqlmodel import Session
+
+from adventure.engine.commands import calculate_score
+from adventure.engine.state import (
+    CAGE,
+    CARRIED,
+    KEYS,
+    LAMP,
+    START_ROOM,
+    GameState,
+    new_game_state,
+)
 from adventure.engine.world import World
+from adventure.models import Player, SavedGame
+from adventure.session import AdventureSession, deserialize_state, serialize_state
+
+# A save written by AdventureSession.save() before snapshots: the player
+# took the lamp and keys, unlocked the grate and picked up the cage in
+# the cobble crawl (room 10).
+LEGACY_SAVE = Path(__file__).parent / "data" / "legacy_save.bin"
 
 
 def test_new_game_state(world: World):
@@ -18,18 +39,139 @@ def test_new_game_state(world: World):
     assert KEYS in state.object_locations
 
 
+def test_new_game_state_does_not_share_world_tables(world: World):
+    """Playing one game leaves the shared World's starting layout untouched."""
+    state = new_game_state(world)
+    state.object_locations[LAMP] = CARRIED
+
+    assert world.initial_object_locations[LAMP] != CARRIED
+    assert new_game_state(world).object_locations[LAMP] != CARRIED
+
+
+def test_visited_rooms_bitset(world: World):
+    """Visited rooms are tracked per room number in a bitset."""
+    state = new_game_state(world)
+    assert not state.has_visited(140)
+    state.mark_visited(140)
+    state.mark_visited(140)
+    assert state.has_visited(140)
+    assert not state.has_visited(139)
+    assert state.visited_rooms_mask == 1 << 140
+
+
+def test_state_has_no_instance_dict(world: World):
+    """GameState stores its fields in slots rather than a per-instance dict."""
+    assert not hasattr(new_game_state(world), "__dict__")
+
+
+def test_teleport(world: World):
+    """teleport moves the player, remembering the room left and the visit."""
+    state = new_game_state(world)
+    state.teleport(99)
+    assert (state.old_room, state.current_room) == (START_ROOM, 99)
+    assert state.has_visited(99)
+
+
+def test_copy_is_independent(world: World):
+    """copy() matches the original but shares no mutable containers."""
+    state = new_game_state(world)
+    state.hints_given.add(2)
+    clone = state.copy()
+
+    assert clone == state
+    for f in fields(GameState):
+        value = getattr(state, f.name)
+        if isinstance(value, dict | list | set):
+            assert getattr(clone, f.name) is not value, f.name
+    assert clone.rng is not state.rng
+    assert clone.rng.random() == state.rng.random()
+
+
 def test_pickle_roundtrip(world: World):
     """GameState survives pickle/unpickle cycle."""
     state = new_game_state(world)
     state.current_room = 15
     state.turns = 42
-    state.visited_rooms.add(15)
+    state.mark_visited(15)
     state.object_locations[LAMP] = CARRIED
 
-    blob = zlib.compress(pickle.dumps(state))
-    restored = pickle.loads(zlib.decompress(blob))
+    restored = pickle.loads(pickle.dumps(state))
 
     assert restored.current_room == 15
     assert restored.turns == 42
-    assert 15 in restored.visited_rooms
+    assert restored.has_visited(15)
     assert restored.object_locations[LAMP] == CARRIED
+
+
+def test_unpickle_state_from_before_slots():
+    """Pickles of the old dict-backed GameState still load."""
+    legacy = {
+        "current_room": 15,
+        "turns": 42,
+        "object_locations": {LAMP: CARRIED},
+        "visited_rooms": {1, 15},
+    }
+    restored = GameState.__new__(GameState)
+    restored.__setstate__(legacy)
+
+    assert restored.current_room == 15
+    assert restored.turns == 42
+    assert restored.object_locations == {LAMP: CARRIED}
+    assert restored.visited_rooms_mask == 1 << 1 | 1 << 15
+    assert restored.lamp_turns == GameState().lamp_turns
+    assert restored.hints_given == set()
+
+
+def test_serialize_roundtrip(world: World):
+    """Save blobs written by the session layer load back intact."""
+    state = new_game_state(world)
+    state.current_room = 15
+    state.mark_visited(15)
+    state.object_locations[LAMP] = CARRIED
+
+    restored = deserialize_state(serialize_state(state))
+
+    assert restored == state
+
+
+def test_save_blob_smaller_than_pickle(world: World):
+    """Uncompressed save blobs stay well under the size of a pickle."""
+    state = new_game_state(world)
+    assert len(serialize_state(state)) < len(pickle.dumps(state)) // 2
+
+
+def test_deserialize_legacy_save():
+    """Zlib-compressed pickles from before snapshots still load."""
+    state = deserialize_state(LEGACY_SAVE.read_bytes())
+
+    assert state.current_room == 10
+    assert state.turns == 11
+    assert {state.object_locations[obj] for obj in (KEYS, LAMP, CAGE)} == {CARRIED}
+    assert all(state.has_visited(room) for room in (1, 3, 4, 7, 8, 9, 10))
+    assert not state.has_visited(11)
+
+
+def test_legacy_save_rejects_other_globals():
+    """Legacy saves may only rebuild a GameState."""
+    blob = zlib.compress(pickle.dumps(Path("x")))
+    with pytest.raises(ValueError):
+        deserialize_state(blob)
+
+
+def test_load_or_create_migrates_legacy_save(
+    world: World, db_session: Session, test_player: Player
+):
+    """A legacy save is restored, rescored and rewritten as a snapshot."""
+    db_session.add(
+        SavedGame(player_id=test_player.id, state_blob=LEGACY_SAVE.read_bytes())
+    )
+    db_session.commit()
+
+    game = AdventureSession.load_or_create(db_session, test_player, world)
+
+    assert game.state.current_room == 10
+    assert game.state.object_locations[CAGE] == CARRIED
+    assert game.state.score == calculate_score(world, game.state) > 0
+    assert game.saved_game is not None
+    assert game.saved_game.score == game.state.score
+    assert game.saved_game.state_blob == serialize_state(game.state)
@@ -13,81 +13,145 @@ Route reference (room exits use vocabulary-resolved verb numbers):
   plover room (r100): plover→r33, ne→r101
 """
 
-import random
+from collections.abc import Mapping, Sequence
+from operator import countOf
+from types import MappingProxyType
 
 import pytest
 
-from adventure.engine.commands import calculate_score, handle_command
-from adventure.engine.state import CARRIED, CHEST, GameState, new_game_state
+from adventure.engine.commands import (
+    advance_until,
+    calculate_score,
+    drop_all_carried,
+    handle_command,
+    handle_commands,
+)
+from adventure.engine.state import (
+    CARRIED,
+    CHEST,
+    DESTROYED,
+    FISSURE,
+    SNAKE,
+    GameState,
+    new_game_state,
+)
 from adventure.engine.world import World
 
 
-def _run(world: World, state: GameState, commands: list[str]) -> list[str]:
-    """Run a list of commands and return all responses."""
-    responses = []
-    for cmd in commands:
-        resp = handle_command(world, state, cmd)
-        responses.append(resp)
-        assert not state.is_finished, f"Game ended unexpectedly after {cmd!r}: {resp}"
-    return responses
+def _run(
+    world: World, state: GameState, commands: Sequence[str], *, finish: bool = False
+) -> None:
+    """Run a list of commands, failing if the game ends partway through.
+
+    handle_commands stops at the command that ends the game, so a single
+    check afterwards is enough to fail on (and name) that command. With
+    *finish*, the last command is expected to end the game instead.
+    """
+    responses = handle_commands(world, state, commands)
+    if finish:
+        assert state.is_finished and len(responses) == len(commands), (
+            f"Expected the game to end on {commands[-1]!r}, but it "
+            f"{'ended early' if state.is_finished else 'went on'}: {responses[-1]}"
+        )
+        return
+    assert not state.is_finished, (
+        f"Game ended unexpectedly after {commands[len(responses) - 1]!r}: "
+        f"{responses[-1]}"
+    )
 
 
-@pytest.fixture(autouse=True)
-def _seed_random():
-    """Pin randomness so dark-room moves are deterministic."""
-    random.seed(42)
+# Pins each game's RNG so dark-room moves are deterministic
+SEED = 42
+
+
+@pytest.fixture
+def seed() -> int:
+    """Seed for conftest's state fixture in this module."""
+    return SEED
 
 
 def _assert_at(state: GameState, room: int) -> None:
-    assert state.current_room == room, (
-        f"Expected room {room}, at room {state.current_room}"
+    current = state.current_room
+    assert current == room, f"Expected room {room}, at room {current}"
+
+
+@pytest.fixture(scope="session")
+def treasure_ids(world: World) -> Mapping[str, int]:
+    """Every vocabulary word that names a treasure, mapped to its object."""
+    return MappingProxyType(
+        {
+            name: obj_n
+            for name, obj_n in world.object_names.items()
+            if world.objects[obj_n].is_treasure
+        }
     )
 
 
-def _assert_in_building(world: World, state: GameState, names: list[str]) -> None:
+def _assert_in_building(
+    state: GameState, treasure_ids: Mapping[str, int], names: list[str]
+) -> None:
     """Assert named treasures are stored in building (room 3)."""
+    location_of = state.object_locations.get
     for name in names:
-        obj_n = world.object_names[name[:5]]
-        assert state.object_locations.get(obj_n) == 3, (
-            f"Treasure {name!r} (obj {obj_n}) not in building "
-            f"(at {state.object_locations.get(obj_n)})"
-        )
+        obj_n = treasure_ids[name]
+        loc = location_of(obj_n)
+        assert loc == 3, f"Treasure {name!r} (obj {obj_n}) not in building (at {loc})"
 
 
 # --- Route: through hall of mt king to Y2 (avoids pit carry restriction) ---
 # r15 → staircase → r19 → n → r28 → n → r33 → plugh → r3
-TO_BUILDING_VIA_Y2 = ["staircase", "n", "n", "plugh"]
+TO_BUILDING_VIA_Y2 = ("staircase", "n", "n", "plugh")
+
+# --- Route: building to swiss cheese ---
+# r3 → plugh → r33 → s → r28 → d → r36 → w → r39 → d → r64 → w → r65 → w → r66
+BUILDING_TO_SWISS_CHEESE = ("plugh", "s", "d", "w", "d", "w", "w")
+
+# --- Prologue: equip, catch the bird, clear the snake at mt king (r19) ---
+SNAKE_CLEARING_PROLOGUE = (
+    "in",
+    "get lamp",
+    "get keys",
+    "xyzzy",
+    "on",
+    "crawl",
+    "get cage",
+    "in",
+    "canyon",
+    "in",  # bird chamber
+    "get bird",
+    "pit",
+    "d",  # hall of mists
+    "staircase",  # hall of mt king
+    "drop bird",  # snake gone
+    "drop cage",
+)
+
+
+@pytest.fixture(scope="session")
+def post_snake_state(world: World) -> GameState:
+    """State after SNAKE_CLEARING_PROLOGUE, played once per session.
+
+    Tests using it are in the "post_snake" xdist group so a parallel run
+    plays the prologue on one worker only.
+    """
+    state = new_game_state(world, seed=SEED)
+    _run(world, state, SNAKE_CLEARING_PROLOGUE)
+    _assert_at(state, 19)
+    return state
 
 
-def test_collect_gold_and_return(world: World) -> None:
-    """Navigate to nugget room, collect gold, return to building."""
-    state = new_game_state(world)
+@pytest.fixture
+def state_after_snake(post_snake_state: GameState) -> GameState:
+    """A private copy of post_snake_state for one test to mutate."""
+    return post_snake_state.copy()
 
-    # Prepare: get lamp, get bird to clear snake
-    _run(
-        world,
-        state,
-        [
-            "in",
-            "get lamp",
-            "get keys",
-            "xyzzy",
-            "on",
-            "crawl",
-            "get cage",
-            "in",
-            "canyon",
-            "in",  # bird chamber
-            "get bird",
-            "pit",
-            "d",  # hall of mists
-            "staircase",  # hall of mt king
-            "drop bird",  # snake gone
-            "drop cage",
-        ],
-    )
-    _assert_at(state, 19)
 
+@pytest.mark.xdist_group("post_snake")
+def test_collect_gold_and_return(
+    world: World, state_after_snake: GameState, treasure_ids: Mapping[str, int]
+) -> None:
+    """Navigate to nugget room, collect gold, return to building."""
+    state = state_after_snake
     # Get gold — carrying gold blocks the pit exit, so return via Y2
     _run(
         world,
@@ -103,13 +167,11 @@ def test_collect_gold_and_return(world: World) -> None:
         ],
     )
     _assert_at(state, 3)
-    obj_n = world.object_names["gold"]
-    assert state.object_locations[obj_n] == 3
+    _assert_in_building(state, treasure_ids, ["gold"])
 
 
-def test_bird_scares_snake(world: World) -> None:
+def test_bird_scares_snake(world: World, state: GameState) -> None:
     """Catch bird, bring to snake, bird scares snake away."""
-    state = new_game_state(world)
     _run(
         world,
         state,
@@ -130,14 +192,14 @@ def test_bird_scares_snake(world: World) -> None:
             "drop bird",  # bird scares snake!
         ],
     )
-    snake_id = world.object_names["snake"]
-    assert state.object_props.get(snake_id) == 1, "Snake should be scared"
-    assert state.object_locations.get(snake_id) == -1, "Snake should be gone"
+    assert state.object_props.get(SNAKE) == 1, "Snake should be scared"
+    assert state.object_locations.get(SNAKE) == DESTROYED, "Snake should be gone"
 
 
-def test_fissure_bridge(world: World) -> None:
+def test_fissure_bridge(
+    world: World, state: GameState, treasure_ids: Mapping[str, int]
+) -> None:
     """Wave rod at fissure to create crystal bridge, cross for diamonds."""
-    state = new_game_state(world)
     _run(
         world,
         state,
@@ -155,8 +217,7 @@ def test_fissure_bridge(world: World) -> None:
             "wave rod",  # bridge appears
         ],
     )
-    fissure_id = world.object_names["fissu"]
-    assert state.object_props.get(fissure_id) == 1, "Bridge should be up"
+    assert state.object_props.get(FISSURE) == 1, "Bridge should be up"
 
     _run(
         world,
@@ -166,13 +227,13 @@ def test_fissure_bridge(world: World) -> None:
             "get diamond",
         ],
     )
-    diamond_id = world.object_names["diamo"]
-    assert state.object_locations[diamond_id] == CARRIED
+    assert state.object_locations[treasure_ids["diamonds"]] == CARRIED
 
 
-def test_plover_teleport(world: World) -> None:
+def test_plover_teleport(
+    world: World, state: GameState, treasure_ids: Mapping[str, int]
+) -> None:
     """Teleport to plover room and collect pyramid."""
-    state = new_game_state(world)
     _run(
         world,
         state,
@@ -199,146 +260,158 @@ def test_plover_teleport(world: World) -> None:
         ],
     )
     _assert_at(state, 3)
-    pyramid_id = world.object_names["pyram"]
-    assert state.object_locations[pyramid_id] == 3
+    _assert_in_building(state, treasure_ids, ["pyramid"])
+
+
+# --- Full walkthrough, split into trips ---
+# Each trip starts where the previous one ended. A session fixture plays
+# each trip once on a copy of the previous trip's state; the tests only
+# check the state a trip left behind, so a broken trip fails its own test
+# (and errors the later ones) without replaying the earlier trips.
+
+# Trip 1: From the cleared snake, collect gold, silver, jewelry, coins
+TRIP1_MT_KING_TREASURES = (
+    # Collect silver
+    "n",
+    "get silver",
+    "hall",
+    # Collect jewelry
+    "s",
+    "get jewelry",
+    "hall",
+    # Collect coins
+    "w",
+    "get coins",
+    "hall",
+    # Get gold (go via mists, back via Y2 to avoid pit restriction)
+    "staircase",
+    "left",
+    "get gold",
+    "hall",
+    *TO_BUILDING_VIA_Y2,
+    # Store
+    "drop gold",
+    "drop silver",
+    "drop jewelry",
+    "drop coins",
+    "drop keys",
+)
+
+# Trip 2: Diamonds via fissure bridge
+TRIP2_DIAMONDS = (
+    "xyzzy",  # debris r11
+    "crawl",
+    "in",  # back to debris via cobble
+    "get rod",
+    "pit",
+    "d",  # hall of mists
+    "onward",  # east bank fissure
+    "wave rod",  # crystal bridge
+    "over",  # west bank r27
+    "get diamond",
+    "over",  # back to east bank r17
+    "hall",  # hall of mists r15
+    *TO_BUILDING_VIA_Y2,
+    "drop diamond",
+    "drop rod",
+)
+
+# Trip 3: Pyramid via plover room
+TRIP3_PYRAMID = (
+    "plugh",  # Y2 r33
+    "plover",  # plover room r100
+    "on",  # lamp on for dark room
+    "ne",  # dark room r101
+    "get pyramid",
+    "s",  # plover room r100
+    "plover",  # Y2 r33
+    "plugh",  # building r3
+    "drop pyramid",
+)
+
+# Trip 4: Emerald from plover room (can't teleport while carrying it), so
+# drop it there and go back for the score without it
+TRIP4_EMERALD = (
+    "plugh",  # Y2 r33
+    "plover",  # plover room r100
+    "get emerald",
+    "drop emerald",
+    "plover",  # Y2 r33
+    "plugh",  # building r3
+)
+
+
+@pytest.fixture(scope="session")
+def state_after_trip1(world: World, post_snake_state: GameState) -> GameState:
+    state = post_snake_state.copy()
+    _run(world, state, TRIP1_MT_KING_TREASURES)
+    return state
+
+
+@pytest.fixture(scope="session")
+def state_after_trip2(world: World, state_after_trip1: GameState) -> GameState:
+    state = state_after_trip1.copy()
+    _run(world, state, TRIP2_DIAMONDS)
+    return state
+
+
+@pytest.fixture(scope="session")
+def state_after_trip3(world: World, state_after_trip2: GameState) -> GameState:
+    state = state_after_trip2.copy()
+    _run(world, state, TRIP3_PYRAMID)
+    return state
+
+
+@pytest.fixture(scope="session")
+def state_after_trip4(world: World, state_after_trip3: GameState) -> GameState:
+    state = state_after_trip3.copy()
+    _run(world, state, TRIP4_EMERALD)
+    return state
+
+
+@pytest.mark.slow
+@pytest.mark.xdist_group("post_snake")
+def test_trip1_mt_king_treasures(
+    state_after_trip1: GameState, treasure_ids: Mapping[str, int]
+) -> None:
+    """Gold, silver, jewelry and coins are stored in the building."""
+    _assert_at(state_after_trip1, 3)
+    _assert_in_building(
+        state_after_trip1, treasure_ids, ["gold", "silver", "jewelry", "coins"]
+    )
 
 
-def test_full_walkthrough(world: World) -> None:
-    """Play through collecting treasures and finish with a solid score."""
-    state = new_game_state(world)
+@pytest.mark.slow
+@pytest.mark.xdist_group("post_snake")
+def test_trip2_diamonds(
+    state_after_trip2: GameState, treasure_ids: Mapping[str, int]
+) -> None:
+    """Diamonds are stored in the building."""
+    _assert_at(state_after_trip2, 3)
+    _assert_in_building(state_after_trip2, treasure_ids, ["diamonds"])
 
-    # ------------------------------------------------------------------
-    # Trip 1: Equip, clear snake, collect gold + silver + jewelry + coins
-    # ------------------------------------------------------------------
-    _run(
-        world,
-        state,
-        [
-            "in",
-            "get lamp",
-            "get keys",
-            "xyzzy",
-            "on",
-            "crawl",
-            "get cage",
-            "in",
-            "canyon",
-            "in",  # bird chamber r13
-            "get bird",
-            "pit",
-            "d",  # hall of mists r15
-            "staircase",  # hall of mt king r19
-            "drop bird",  # snake gone
-            "drop cage",
-            # Collect silver
-            "n",
-            "get silver",
-            "hall",
-            # Collect jewelry
-            "s",
-            "get jewelry",
-            "hall",
-            # Collect coins
-            "w",
-            "get coins",
-            "hall",
-            # Get gold (go via mists, back via Y2 to avoid pit restriction)
-            "staircase",
-            "left",
-            "get gold",
-            "hall",
-            *TO_BUILDING_VIA_Y2,
-            # Store
-            "drop gold",
-            "drop silver",
-            "drop jewelry",
-            "drop coins",
-            "drop keys",
-        ],
-    )
-    _assert_at(state, 3)
-    _assert_in_building(world, state, ["gold", "silver", "jewelry", "coins"])
 
-    # ------------------------------------------------------------------
-    # Trip 2: Diamonds via fissure bridge
-    # ------------------------------------------------------------------
-    _run(
-        world,
-        state,
-        [
-            "xyzzy",  # debris r11
-            "crawl",
-            "in",  # back to debris via cobble
-            "get rod",
-            "pit",
-            "d",  # hall of mists
-            "onward",  # east bank fissure
-            "wave rod",  # crystal bridge
-            "over",  # west bank r27
-            "get diamond",
-            "over",  # back to east bank r17
-            "hall",  # hall of mists r15
-            *TO_BUILDING_VIA_Y2,
-            "drop diamond",
-            "drop rod",
-        ],
-    )
-    _assert_at(state, 3)
-    _assert_in_building(world, state, ["diamonds"])
-
-    # ------------------------------------------------------------------
-    # Trip 3: Pyramid via plover room
-    # ------------------------------------------------------------------
-    _run(
-        world,
-        state,
-        [
-            "plugh",  # Y2 r33
-            "plover",  # plover room r100
-            "on",  # lamp on for dark room
-            "ne",  # dark room r101
-            "get pyramid",
-            "s",  # plover room r100
-            "plover",  # Y2 r33
-            "plugh",  # building r3
-            "drop pyramid",
-        ],
-    )
-    _assert_at(state, 3)
-    _assert_in_building(world, state, ["pyramid"])
+@pytest.mark.slow
+@pytest.mark.xdist_group("post_snake")
+def test_trip3_pyramid(
+    state_after_trip3: GameState, treasure_ids: Mapping[str, int]
+) -> None:
+    """The pyramid is stored in the building."""
+    _assert_at(state_after_trip3, 3)
+    _assert_in_building(state_after_trip3, treasure_ids, ["pyramid"])
 
-    # ------------------------------------------------------------------
-    # Trip 4: Emerald from plover room (can't teleport while carrying it)
-    # ------------------------------------------------------------------
-    _run(
-        world,
-        state,
-        [
-            "plugh",  # Y2 r33
-            "plover",  # plover room r100
-            "get emerald",
-            # plover teleport forbids carrying emerald — walk back
-            # plover room w → ? Let's go via known cave route
-            # Actually: drop emerald, plover to Y2, walk to plover, pick up
-            # Simpler: carry emerald and walk out via the cave
-        ],
-    )
 
-    # Drop emerald and navigate back to building, skipping for score
-    handle_command(world, state, "drop emerald")
-    _run(world, state, ["plover", "plugh"])  # Y2 → building
+@pytest.mark.slow
+@pytest.mark.xdist_group("post_snake")
+def test_full_walkthrough(world: World, state_after_trip4: GameState) -> None:
+    """After all four trips, the game finishes with a solid score."""
+    state = state_after_trip4.copy()
     _assert_at(state, 3)
 
-    # ------------------------------------------------------------------
-    # Score and finish
-    # ------------------------------------------------------------------
-    score_before_quit = calculate_score(world, state)
-    treasures_in_building = sum(
-        1
-        for obj_id, obj in world.objects.items()
-        if obj.is_treasure and state.object_locations.get(obj_id) == 3
-    )
-    total_treasures = sum(1 for obj in world.objects.values() if obj.is_treasure)
+    score_before_quit = state.score
+    locations = state.object_locations
+    treasures_in_building = countOf(map(locations.get, world.treasure_ids), 3)
+    total_treasures = len(world.treasure_ids)
 
     assert treasures_in_building >= 6, (
         f"Only {treasures_in_building}/{total_treasures} treasures in building"
@@ -346,9 +419,8 @@ def test_full_walkthrough(world: World) -> None:
     assert score_before_quit >= 50, f"Score {score_before_quit} is too low"
 
     # Finish the game
-    handle_command(world, state, "quit")
-    assert state.is_finished
-    final_score = calculate_score(world, state)
+    _run(world, state, ["quit"], finish=True)
+    final_score = state.score
     # gave_up penalty is -4 points
     assert final_score == score_before_quit - 4
 
@@ -382,7 +454,7 @@ def _phase_equip_and_clear_snake(world, state):
     _assert_at(state, 19)
 
 
-def _phase_diamonds_and_pirate(world, state):
+def _phase_diamonds_and_pirate(world, state, treasure_ids):
     """Phase 2: Fissure bridge + diamonds, simulate pirate, recover."""
     _run(
         world,
@@ -397,23 +469,19 @@ def _phase_diamonds_and_pirate(world, state):
         ],
     )
     # Simulate pirate stealing diamonds and stashing with chest
-    state.object_locations[world.object_names["diamo"]] = 64
+    state.object_locations[treasure_ids["diamonds"]] = 64
     state.object_locations[CHEST] = 64
     state.object_props[CHEST] = 0
     # Teleport to pirate's dead end
-    state.old_room = state.current_room
-    state.current_room = 64
-    state.visited_rooms.add(64)
+    state.teleport(64)
     _run(world, state, ["get chest", "get diamond"])
     # Teleport out to bird chamber
-    state.old_room = state.current_room
-    state.current_room = 13
-    state.visited_rooms.add(13)
+    state.teleport(13)
     _run(world, state, ["w", "d", "d"])
     _assert_at(state, 19)
 
 
-def _phase_mt_king_treasures(world, state):
+def _phase_mt_king_treasures(world, state, treasure_ids):
     """Phase 3: Coins, jewelry, dragon/rug, gold, silver → building."""
     _run(
         world,
@@ -434,16 +502,11 @@ def _phase_mt_king_treasures(world, state):
             "n",  # → low N/S passage r28
         ],
     )
-    handle_command(world, state, "get silver")
-    _run(world, state, ["n", "plugh", "drop gold"])
-    for t in ["diamo", "jewel", "coins", "chest", "rug", "silve"]:
-        obj_n = world.object_names.get(t)
-        if obj_n and state.object_locations.get(obj_n) == CARRIED:
-            handle_command(world, state, f"drop {t}")
+    _run(world, state, ["get silver", "n", "plugh", "drop gold"])
+    drop_all_carried(world, state, world.treasure_ids)
     _assert_at(state, 3)
     # Get gold if not yet stored
-    gold_n = world.object_names["gold"]
-    if state.object_locations.get(gold_n) != 3:
+    if state.object_locations.get(treasure_ids["gold"]) != 3:
         _run(
             world,
             state,
@@ -486,11 +549,9 @@ def _phase_pyramid_and_emerald(world, state):
     )
     _assert_at(state, 3)
     # Emerald via alcove: teleport to alcove (r99), squeeze to plover
-    _run(world, state, ["plugh", "s", "d", "w", "d", "w", "w"])
+    _run(world, state, BUILDING_TO_SWISS_CHEESE)
     # Now at swiss cheese r66; teleport to alcove r99
-    state.old_room = state.current_room
-    state.current_room = 99  # alcove
-    state.visited_rooms.add(99)
+    state.teleport(99)  # alcove
     # Drop items and squeeze through to plover
     _run(
         world,
@@ -503,13 +564,10 @@ def _phase_pyramid_and_emerald(world, state):
         ],
     )
     # Teleport through tight tunnel (our travel table kills otherwise)
-    state.old_room = 99
-    state.current_room = 100  # plover room
-    state.visited_rooms.add(100)
-    handle_command(world, state, "get emerald")
+    state.teleport(100)  # plover room
+    _run(world, state, ["get emerald"])
     # Go back to alcove (w from plover) — same tight tunnel issue
-    state.old_room = 100
-    state.current_room = 99  # alcove
+    state.teleport(99)  # alcove
     _run(
         world,
         state,
@@ -522,9 +580,7 @@ def _phase_pyramid_and_emerald(world, state):
     )
     # Navigate back: alcove → misty cavern → ...
     # Teleport to swiss cheese for reliable exit
-    state.old_room = state.current_room
-    state.current_room = 66  # swiss cheese
-    state.visited_rooms.add(66)
+    state.teleport(66)  # swiss cheese
     _run(
         world,
         state,
@@ -548,13 +604,7 @@ def _phase_plant_eggs_trident(world, state):
         world,
         state,
         [
-            "plugh",
-            "s",
-            "d",
-            "w",
-            "d",
-            "w",
-            "w",  # → swiss cheese r66
+            *BUILDING_TO_SWISS_CHEESE,  # → swiss cheese r66
             "w",
             "w",  # → east twopit r67 → west twopit r23
             "d",
@@ -686,22 +736,13 @@ def _phase_pearl_vase_pillow(world, state):
         ],
     )
     _assert_at(state, 3)
-    for t in ["eggs", "tride", "pearl", "spice", "chain"]:
-        obj_n = world.object_names.get(t)
-        if obj_n and state.object_locations.get(obj_n) == CARRIED:
-            handle_command(world, state, f"drop {t}")
+    drop_all_carried(world, state, world.treasure_ids)
     # Vase + pillow: navigate to oriental room r97
     _run(
         world,
         state,
         [
-            "plugh",
-            "s",
-            "d",
-            "w",
-            "d",
-            "w",
-            "w",  # → swiss cheese r66
+            *BUILDING_TO_SWISS_CHEESE,  # → swiss cheese r66
             "oriental",  # → oriental room r97
             "get vase",
             "se",  # → swiss cheese r66
@@ -725,9 +766,8 @@ def _phase_pearl_vase_pillow(world, state):
 def _phase_closing_and_endgame(world, state):
     """Phase 11-12: Trigger closing, magazine, endgame blast."""
     # Mark all treasures as found for closing trigger
-    for obj_id, obj in world.objects.items():
-        if obj.is_treasure and obj_id not in state.object_props:
-            state.object_props[obj_id] = 0
+    for obj_id in world.treasure_ids:
+        state.object_props.setdefault(obj_id, 0)
 
     # Navigate deep to trigger closing clock
     _run(
@@ -743,10 +783,8 @@ def _phase_closing_and_endgame(world, state):
             "n",
         ],
     )
-    while not state.is_closing:
-        handle_command(world, state, "s")
-        if not state.is_closing:
-            handle_command(world, state, "n")
+    advance_until(world, state, lambda s: s.is_closing, ("s", "n"))
+    assert state.is_closing
 
     # plugh is now blocked
     resp = handle_command(world, state, "plugh")
@@ -759,18 +797,18 @@ def _phase_closing_and_endgame(world, state):
     _assert_at(state, 108)
 
     # Wait for cave to close
-    while not state.is_closed:
-        handle_command(world, state, "n")
+    advance_until(world, state, lambda s: s.is_closed, ("n",))
     _assert_at(state, 115)
 
     # Endgame: pick up rod2 at 115, go to SW end (116) for max bonus
-    _run(world, state, ["get rod", "sw"])
-    resp = handle_command(world, state, "blast")
-    assert state.is_finished
+    _run(world, state, ["get rod", "sw", "blast"], finish=True)
     assert state.bonus == 133
 
 
-def test_full_350_walkthrough(world: World) -> None:
+@pytest.mark.slow
+def test_full_350_walkthrough(
+    world: World, state: GameState, treasure_ids: Mapping[str, int]
+) -> None:
     """Full 350-point walkthrough based on walkthrough2.txt.
 
     Follows the classic route: collect all 15 treasures, trigger cave
@@ -778,7 +816,6 @@ def test_full_350_walkthrough(world: World) -> None:
     Dwarf/pirate encounters are state-manipulated for determinism
     since the AI involves randomness.
     """
-    state = new_game_state(world)
     # Disable dwarf/pirate AI for deterministic walkthrough — we
     # manipulate state for those encounters and set dwarf_stage for scoring.
     state.dwarf_locations = []
@@ -787,8 +824,8 @@ def test_full_350_walkthrough(world: World) -> None:
     state.pirate_location = 0
 
     _phase_equip_and_clear_snake(world, state)
-    _phase_diamonds_and_pirate(world, state)
-    _phase_mt_king_treasures(world, state)
+    _phase_diamonds_and_pirate(world, state, treasure_ids)
+    _phase_mt_king_treasures(world, state, treasure_ids)
     _phase_pyramid_and_emerald(world, state)
     _phase_plant_eggs_trident(world, state)
     _phase_troll_bear_spices(world, state)